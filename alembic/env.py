@@ -1,4 +1,5 @@
 import asyncio
+import os
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -13,6 +14,12 @@ from app.models.models import Base, User, TodoList, Todos
 # access to the values within the .ini file in use.
 config = context.config
 
+# 与 app.core.database 迁移同一个数据库文件
+if "SQLITE_DB_PATH" in os.environ:
+    config.set_main_option(
+        "sqlalchemy.url", f"sqlite+aiosqlite:///{os.environ['SQLITE_DB_PATH']}"
+    )
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -24,6 +31,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Skip the FTS5 virtual table and its shadow tables during autogenerate;
+    they are maintained by hand-written migrations."""
+    if type_ == "table":
+        return not (name or "").startswith("todos_fts")
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -46,6 +63,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -55,7 +73,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,59 @@
+"""Cascade deletes from lists to todos
+
+Revision ID: 5d8c2b7e1f43
+Revises: e93b5d17a4c6
+Create Date: 2026-10-17 14:05:12.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8c2b7e1f43'
+down_revision: Union[str, None] = 'e93b5d17a4c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite 反射出的外键没有名字，批量模式下按约定命名后才能删除
+naming_convention = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s",
+}
+
+
+def _create_fts_triggers() -> None:
+    # 批量模式会重建 todos 表，表上的触发器随之删除，需要重新创建
+    op.execute(
+        "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_au AFTER UPDATE OF content ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('todos', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_todos_list_id_lists', type_='foreignkey')
+        batch_op.create_foreign_key(
+            'fk_todos_list_id_lists', 'lists', ['list_id'], ['id'], ondelete='CASCADE'
+        )
+    _create_fts_triggers()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('todos', naming_convention=naming_convention) as batch_op:
+        batch_op.drop_constraint('fk_todos_list_id_lists', type_='foreignkey')
+        batch_op.create_foreign_key('fk_todos_list_id_lists', 'lists', ['list_id'], ['id'])
+    _create_fts_triggers()
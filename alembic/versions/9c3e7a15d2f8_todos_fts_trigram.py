@@ -0,0 +1,61 @@
+"""Rebuild todos_fts with the trigram tokenizer
+
+Revision ID: 9c3e7a15d2f8
+Revises: b72d4e9a1c06
+Create Date: 2026-10-17 13:05:41.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e7a15d2f8'
+down_revision: Union[str, None] = 'b72d4e9a1c06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_fts(tokenize: str) -> None:
+    op.execute(
+        "CREATE VIRTUAL TABLE todos_fts USING fts5("
+        f"content, content='todos', content_rowid='id', {tokenize})"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_au AFTER UPDATE OF content ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def _drop_fts() -> None:
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ai")
+    op.execute("DROP TABLE IF EXISTS todos_fts")
+
+
+def upgrade() -> None:
+    # unicode61 把连续的中文当作一个词，"牛奶" 搜不到 "买牛奶"；
+    # trigram 按三字切分，支持任意位置的子串匹配（SQLite >= 3.34）
+    _drop_fts()
+    _create_fts("tokenize='trigram'")
+
+
+def downgrade() -> None:
+    _drop_fts()
+    _create_fts("tokenize='unicode61 remove_diacritics 2', prefix='2 3'")
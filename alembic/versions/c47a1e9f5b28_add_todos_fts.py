@@ -0,0 +1,52 @@
+"""Add FTS5 index on todos.content
+
+Revision ID: c47a1e9f5b28
+Revises: 8b2e4f61c0d3
+Create Date: 2026-10-17 11:32:08.640571
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47a1e9f5b28'
+down_revision: Union[str, None] = '8b2e4f61c0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 外部内容表：只存倒排索引，正文仍在 todos 中
+    op.execute(
+        "CREATE VIRTUAL TABLE todos_fts USING fts5("
+        "content, content='todos', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_au AFTER UPDATE OF content ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO todos_fts(rowid, content) VALUES (new.id, new.content); "
+        "END"
+    )
+    # 为已有数据建立索引
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ai")
+    op.execute("DROP TABLE IF EXISTS todos_fts")
@@ -0,0 +1,90 @@
+"""Count only the list owner's todos in list_stats
+
+Revision ID: d5e2a8f47b13
+Revises: 9c3e7a15d2f8
+Create Date: 2026-10-17 16:02:18.541907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e2a8f47b13'
+down_revision: Union[str, None] = '9c3e7a15d2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 一行待办对各计数列的贡献，row 为 new 或 old
+_DELTAS = (
+    "total = total {op} 1, "
+    "completed = completed {op} ({row}.completed != 0), "
+    "low = low {op} ({row}.priority = 'low'), "
+    "medium = medium {op} ({row}.priority = 'medium'), "
+    "high = high {op} ({row}.priority = 'high')"
+)
+
+# 待办的 user_id 与列表所有者不同时不计入，其他用户无法改变列表的汇总
+_OWNED = "AND {row}.user_id = (SELECT user_id FROM lists WHERE lists.id = {row}.list_id)"
+
+
+def _apply(row: str, op_: str, owned: bool) -> str:
+    condition = _OWNED.format(row=row) if owned else ""
+    return (
+        f"UPDATE list_stats SET {_DELTAS.format(op=op_, row=row)} "
+        f"WHERE list_id = {row}.list_id {condition}; "
+    )
+
+
+def _create_triggers(owned: bool) -> None:
+    op.execute(
+        "CREATE TRIGGER list_stats_todo_ai AFTER INSERT ON todos BEGIN "
+        + _apply("new", "+", owned)
+        + "END"
+    )
+    op.execute(
+        "CREATE TRIGGER list_stats_todo_ad AFTER DELETE ON todos BEGIN "
+        + _apply("old", "-", owned)
+        + "END"
+    )
+    op.execute(
+        "CREATE TRIGGER list_stats_todo_au AFTER UPDATE OF completed, priority, list_id ON todos BEGIN "
+        + _apply("old", "-", owned)
+        + _apply("new", "+", owned)
+        + "END"
+    )
+
+
+def _drop_triggers() -> None:
+    op.execute("DROP TRIGGER IF EXISTS list_stats_todo_au")
+    op.execute("DROP TRIGGER IF EXISTS list_stats_todo_ad")
+    op.execute("DROP TRIGGER IF EXISTS list_stats_todo_ai")
+
+
+def _recount(owned: bool) -> None:
+    condition = "AND todos.user_id = lists.user_id" if owned else ""
+    op.execute(
+        "REPLACE INTO list_stats(list_id, total, completed, low, medium, high) "
+        "SELECT lists.id, count(todos.id), "
+        "coalesce(sum(todos.completed != 0), 0), "
+        "coalesce(sum(todos.priority = 'low'), 0), "
+        "coalesce(sum(todos.priority = 'medium'), 0), "
+        "coalesce(sum(todos.priority = 'high'), 0) "
+        f"FROM lists LEFT JOIN todos ON todos.list_id = lists.id {condition} "
+        "GROUP BY lists.id"
+    )
+
+
+def upgrade() -> None:
+    _drop_triggers()
+    _create_triggers(owned=True)
+    # 去掉此前计入的其他用户的待办
+    _recount(owned=True)
+
+
+def downgrade() -> None:
+    _drop_triggers()
+    _create_triggers(owned=False)
+    _recount(owned=False)
@@ -0,0 +1,46 @@
+"""Order todos by priority rank instead of enum name
+
+Revision ID: f3b8c61e2d57
+Revises: d5e2a8f47b13
+Create Date: 2026-10-17 16:40:12.306518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8c61e2d57'
+down_revision: Union[str, None] = 'd5e2a8f47b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 与 app.models.models.PRIORITY_RANK 相同；迁移不导入应用代码
+PRIORITY_RANK = "CASE priority WHEN 'low' THEN 1 WHEN 'medium' THEN 2 WHEN 'high' THEN 3 END"
+
+
+def upgrade() -> None:
+    # SQLite 只能用 ALTER TABLE 添加 VIRTUAL 生成列
+    op.add_column('todos', sa.Column('priority_rank', sa.Integer(), sa.Computed(PRIORITY_RANK, persisted=False)))
+    op.drop_index('ix_todos_list_completed_priority', table_name='todos')
+    op.drop_index('ix_todos_list_priority', table_name='todos')
+    op.drop_index('ix_todos_user_completed_priority', table_name='todos')
+    op.drop_index('ix_todos_user_priority', table_name='todos')
+    op.create_index('ix_todos_user_priority_rank', 'todos', ['user_id', 'priority_rank'], unique=False)
+    op.create_index('ix_todos_user_completed_priority_rank', 'todos', ['user_id', 'completed', 'priority_rank'], unique=False)
+    op.create_index('ix_todos_list_priority_rank', 'todos', ['list_id', 'priority_rank'], unique=False)
+    op.create_index('ix_todos_list_completed_priority_rank', 'todos', ['list_id', 'completed', 'priority_rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_todos_list_completed_priority_rank', table_name='todos')
+    op.drop_index('ix_todos_list_priority_rank', table_name='todos')
+    op.drop_index('ix_todos_user_completed_priority_rank', table_name='todos')
+    op.drop_index('ix_todos_user_priority_rank', table_name='todos')
+    op.create_index('ix_todos_user_priority', 'todos', ['user_id', 'priority'], unique=False)
+    op.create_index('ix_todos_user_completed_priority', 'todos', ['user_id', 'completed', 'priority'], unique=False)
+    op.create_index('ix_todos_list_priority', 'todos', ['list_id', 'priority'], unique=False)
+    op.create_index('ix_todos_list_completed_priority', 'todos', ['list_id', 'completed', 'priority'], unique=False)
+    op.drop_column('todos', 'priority_rank')
@@ -0,0 +1,186 @@
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a fixed TTL.
+
+    Not thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None on a miss or expired entry."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def values(self) -> list[Any]:
+        """Stored values, including expired ones not yet evicted."""
+        return [value for _, value in self._data.values()]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def approx_size(value: Any) -> int:
+    """Rough deep size in bytes of a cached value, for memory stats."""
+    size = sys.getsizeof(value)
+    if isinstance(value, BaseModel):
+        return size + approx_size(value.__dict__)
+    if isinstance(value, dict):
+        return size + sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return size + sum(approx_size(item) for item in value)
+    return size
+
+
+class CacheBackend(ABC):
+    """Storage behind ResponseCache.
+
+    Async so that a store shared between workers can implement it. Besides
+    plain entries, a backend keeps an integer generation per scope; bumping
+    it makes every entry written under the old generation unreachable.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    async def get_generation(self, scope: str) -> int: ...
+
+    @abstractmethod
+    async def bump_generation(self, scope: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process backend: a TTLCache plus a dict of scope generations."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries.set(key, (value, approx_size(value)))
+
+    async def get_generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    async def bump_generation(self, scope: str) -> None:
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        # 代数只增不减，避免清空后与旧条目的键重合
+        for scope in self._generations:
+            self._generations[scope] += 1
+
+    def stats(self) -> dict:
+        stats = self._entries.stats()
+        stats["approx_bytes"] = sum(size for _, size in self._entries.values())
+        stats["scopes"] = len(self._generations)
+        return stats
+
+
+class ResponseCache:
+    """Read-through cache for service results, invalidated per scope.
+
+    Keys embed the scope's current generation, so ``invalidate`` is exact:
+    a result loaded concurrently with a write is stored under the old
+    generation and never served afterwards. Keys also embed the caller's
+    data version (the one its ETag is built from); generations are local
+    to a worker, the version is not, so a write made by another worker
+    misses the cache even before its invalidation message arrives.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    async def get_or_load(
+        self,
+        scope: str,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        version: int | None = None,
+    ) -> Any:
+        """Return the cached result for ``key`` in ``scope``, loading it on a miss.
+
+        Without a data ``version`` the result is loaded and not cached.
+        """
+        if not self.enabled or version is None:
+            return await loader()
+        generation = await self.backend.get_generation(scope)
+        full_key = f"{scope}:{generation}:{version}:{key}"
+        value = await self.backend.get(full_key)
+        if value is None:
+            value = await loader()
+            await self.backend.set(full_key, value)
+        return value
+
+    async def invalidate(self, scope: str) -> None:
+        """Drop every cached result of a scope."""
+        await self.backend.bump_generation(scope)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.backend.stats()}
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
 
 
 
@@ -10,8 +11,58 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     JWT_ALGORITHM: str
     JWT_EXPIRATION: int = 30
+    JWT_REFRESH_EXPIRATION: int = 60 * 24 * 14  # minutes
+    # Sign id/username/email/version into access tokens so that
+    # get_current_user can skip the database
+    JWT_STATELESS: bool = False
     DEBUG: bool = False
 
+    # Argon2 hashing pool
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hash jobs allowed to wait or run at once before new ones are rejected
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # SQLite/engine tuning. DB_PROFILE picks a preset ("default" or
+    # "production"); any SQLITE_* value set here overrides the preset.
+    DB_PROFILE: Literal["default", "production"] = "default"
+    DB_ECHO: bool | None = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    SQLITE_JOURNAL_MODE: str | None = None
+    SQLITE_SYNCHRONOUS: str | None = None
+    SQLITE_CACHE_SIZE: int | None = None  # pages, or KiB if negative
+    SQLITE_MMAP_SIZE: int | None = None  # bytes
+    SQLITE_BUSY_TIMEOUT: int | None = None  # milliseconds
+    SQLITE_TEMP_STORE: str | None = None
+
+    # Route all writes through one writer connection with group commit;
+    # the regular connection pool becomes read-only
+    DB_WRITER_ENABLED: bool = False
+    DB_WRITER_MAX_BATCH: int = 64
+    DB_WRITER_MAX_QUEUE: int = 1024
+
+    # Maximum number of todos accepted by one batch request
+    TODO_BATCH_MAX_SIZE: int = 500
+
+    # Seconds between background checks that repair drifted list_stats
+    # counters; 0 disables the reconciler
+    LIST_STATS_RECONCILE_INTERVAL: int = 300
+
+    # Authenticated-user cache used by get_current_user
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL: int = 60  # seconds
+    # Account versions checked against stateless tokens; a miss reads the database
+    USER_VERSION_CACHE_SIZE: int = 10000
+    USER_VERSION_CACHE_TTL: int = 60  # seconds
+
+    # Read-through cache of list/todo query results, scoped per user and
+    # invalidated on every write
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_SIZE: int = 4096
+    RESPONSE_CACHE_TTL: int = 30  # seconds
+
     model_config = SettingsConfigDict(env_file=("./.env", ".env.local"))
         
 
@@ -1,7 +1,9 @@
 import os
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
+from app.core.config import settings
 from app.models.models import Base, User, TodoList, Todos
 
 # 从环境变量获取数据库路径，默认为 data/db.sqlite3
@@ -9,12 +11,79 @@ database_path = os.getenv("SQLITE_DB_PATH", "data/todos.sqlite3")
 SQLITE_DATABASE_URL = f"sqlite+aiosqlite:///{database_path}"
 
 
-engine = create_async_engine(SQLITE_DATABASE_URL, echo=True)
+# 性能预设：default 保持 SQLite 默认行为，production 适合多 worker 共享同一数据库文件
+DB_PROFILES = {
+    "default": {
+        "echo": True,
+        "pragmas": {},
+    },
+    "production": {
+        "echo": False,
+        "pragmas": {
+            "journal_mode": "WAL",  # 读写互不阻塞
+            "synchronous": "NORMAL",  # WAL 下只在检查点 fsync
+            "cache_size": -64000,  # 64 MiB
+            "mmap_size": 268435456,  # 256 MiB
+            "busy_timeout": 5000,  # 等待写锁而不是立即报 "database is locked"
+            "temp_store": "MEMORY",
+        },
+    },
+}
+
+
+def get_sqlite_pragmas() -> dict:
+    """PRAGMAs for the configured profile, with per-setting overrides applied."""
+    # 外键约束（含 ON DELETE CASCADE）在 SQLite 中需逐连接开启
+    pragmas = {"foreign_keys": "ON"}
+    pragmas.update(DB_PROFILES[settings.DB_PROFILE]["pragmas"])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value is not None})
+    return pragmas
+
+
+SQLITE_PRAGMAS = get_sqlite_pragmas()
+DB_ECHO = (
+    settings.DB_ECHO
+    if settings.DB_ECHO is not None
+    else DB_PROFILES[settings.DB_PROFILE]["echo"]
+)
+
+
+engine = create_async_engine(
+    SQLITE_DATABASE_URL,
+    echo=DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+)
 SessionLocal = async_sessionmaker(
     class_=AsyncSession, expire_on_commit=False, bind=engine
 )
 
 
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the profile's PRAGMAs to every new connection."""
+    pragmas = SQLITE_PRAGMAS
+    if settings.DB_WRITER_ENABLED:
+        # 写操作全部交给 app.core.writer，连接池只用于读
+        pragmas = {**pragmas, "query_only": "ON"}
+    apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with SessionLocal() as session:
         yield session
@@ -1,6 +1,20 @@
 from fastapi import HTTPException, status
 
 
+class NotModifiedException(HTTPException):
+    """Raised when a conditional GET matches the client's cached ETag."""
+
+    def __init__(self, etag: str):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+class BadRequestException(HTTPException):
+    """Base exception for malformed request errors."""
+
+    def __init__(self, detail: str = "Bad request"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
 class NotFoundException(HTTPException):
     """Base exception for resource not found errors."""
 
@@ -26,4 +40,15 @@ class ForbiddenException(HTTPException):
     """Base exception for forbidden access errors."""
 
     def __init__(self, detail: str = "Access forbidden"):
-        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
\ No newline at end of file
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class ServiceUnavailableException(HTTPException):
+    """Base exception for temporarily overloaded services."""
+
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
\ No newline at end of file
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+from uuid import uuid4
+
+from app.core.logging import get_logger
+from app.utils.rabbitmq import RabbitMQClient
+
+logger = get_logger(__name__)
+
+INVALIDATION_EXCHANGE = "cache_invalidations"
+FLUSH_ALL = "*"  # 特殊键：清空全部缓存
+
+InvalidationHandler = Callable[[int, list[str]], Awaitable[None]]
+FlushHandler = Callable[[], Awaitable[None]]
+
+
+class InvalidationBus:
+    """Broadcasts cache invalidations to the other workers.
+
+    Writers publish ``{user_id, keys}`` after commit; every worker applies
+    the messages of its peers through the registered handlers. Each worker
+    numbers its messages, so a receiver that sees a gap in a peer's
+    sequence knows it missed invalidations and flushes its caches, just as
+    it does after reconnecting to RabbitMQ.
+    """
+
+    def __init__(self, exchange: str = INVALIDATION_EXCHANGE):
+        self.exchange = exchange
+        self.worker_id = uuid4().hex
+        self._seq = 0
+        self._last_seen: dict[str, int] = {}  # origin worker -> 最后收到的序号
+        self._handlers: list[InvalidationHandler] = []
+        self._flush_handlers: list[FlushHandler] = []
+        # 事件循环只弱引用任务，后台任务需保留强引用直到完成
+        self._tasks: set[asyncio.Task] = set()
+        self.published = 0
+        self.publish_failures = 0
+        self.received = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def register(
+        self, handler: InvalidationHandler, flush: FlushHandler | None = None
+    ) -> None:
+        """Register a cache's message handler and its flush-everything hook."""
+        self._handlers.append(handler)
+        if flush is not None:
+            self._flush_handlers.append(flush)
+
+    async def publish(self, user_id: int, keys: list[str]) -> None:
+        """Broadcast an invalidation. Failures are logged, never raised."""
+        self._seq += 1
+        message = {
+            "origin": self.worker_id,
+            "seq": self._seq,
+            "user_id": user_id,
+            "keys": keys,
+            "ts": time.time(),
+        }
+        try:
+            await RabbitMQClient().publish_fanout(message, exchange=self.exchange)
+            self.published += 1
+        except Exception as e:
+            # 本 worker 已失效本地缓存，广播失败只影响其他 worker（由 TTL 兜底）
+            self.publish_failures += 1
+            logger.error(f"Failed to broadcast invalidation for user {user_id}: {e}")
+
+    def publish_soon(self, user_id: int, keys: list[str]) -> None:
+        """Broadcast an invalidation from synchronous code, without waiting for it."""
+        self._spawn(self.publish(user_id, keys))
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Invalidation background task failed: {task.exception()!r}")
+
+    async def flush(self) -> None:
+        """Clear every registered cache of this worker."""
+        self.flushes += 1
+        for flush in self._flush_handlers:
+            await flush()
+
+    async def broadcast_flush(self) -> None:
+        """Clear every registered cache in all workers."""
+        await self.flush()
+        await self.publish(0, [FLUSH_ALL])
+
+    async def _on_message(self, message: dict) -> None:
+        origin = message["origin"]
+        if origin == self.worker_id:
+            return  # 自己发出的消息，本地已处理
+        self.received += 1
+        latency = max(time.time() - float(message["ts"]), 0.0)
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+        seq = int(message["seq"])
+        last = self._last_seen.get(origin)
+        self._last_seen[origin] = max(seq, last or 0)
+        if last is not None and seq > last + 1:
+            self.dropped += seq - last - 1
+            logger.warning(f"Missed {seq - last - 1} invalidations from worker {origin}, flushing caches")
+            await self.flush()
+            return
+        if FLUSH_ALL in message["keys"]:
+            await self.flush()
+            return
+        for handler in self._handlers:
+            await handler(int(message["user_id"]), list(message["keys"]))
+
+    def _on_reconnect(self) -> None:
+        # 断线期间的消息已丢失，无法得知哪些缓存过期
+        logger.warning("Invalidation channel reconnected, flushing caches")
+        self._spawn(self.flush())
+
+    async def listen(self, retry_interval: float = 5.0) -> None:
+        """Apply invalidations broadcast by other workers, reconnecting on failure."""
+        while True:
+            try:
+                await RabbitMQClient().consume_fanout(
+                    self.exchange, self._on_message, on_reconnect=self._on_reconnect
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Invalidation listener failed, retrying in {retry_interval}s: {e}")
+                await asyncio.sleep(retry_interval)
+                await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "publish_failures": self.publish_failures,
+            "received": self.received,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "avg_latency_ms": 1000 * self.latency_total / self.received if self.received else 0.0,
+            "max_latency_ms": 1000 * self.latency_max,
+        }
+
+
+invalidation_bus = InvalidationBus()
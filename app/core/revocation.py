@@ -0,0 +1,72 @@
+import asyncio
+import heapq
+import time
+
+from app.core.logging import get_logger
+from app.utils.rabbitmq import RabbitMQClient
+
+logger = get_logger(__name__)
+
+REVOCATION_EXCHANGE = "token_revocations"
+
+
+class TokenDenylist:
+    """In-memory set of revoked token IDs.
+
+    Each entry is kept only until its token's ``exp``. After that the token
+    fails signature validation anyway, so memory stays bounded by the number
+    of live revoked tokens.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+        self._expiry: list[tuple[float, str]] = []  # 按过期时间排序的小顶堆
+
+    def add(self, jti: str, exp: float) -> None:
+        """Revoke a token ID until the given expiry (unix timestamp)."""
+        self._purge()
+        if exp <= time.time() or jti in self._entries:
+            return
+        self._entries[jti] = exp
+        heapq.heappush(self._expiry, (exp, jti))
+
+    def __contains__(self, jti: object) -> bool:
+        return jti in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _purge(self) -> None:
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            _, jti = heapq.heappop(self._expiry)
+            self._entries.pop(jti, None)
+
+
+token_denylist = TokenDenylist()
+
+
+async def revoke_token(jti: str, exp: float) -> None:
+    """Revoke a token in this worker and broadcast it to the other workers."""
+    token_denylist.add(jti, exp)
+    try:
+        await RabbitMQClient().publish_fanout({"jti": jti, "exp": exp}, exchange=REVOCATION_EXCHANGE)
+    except Exception as e:
+        # 本 worker 已生效，广播失败只影响其他 worker
+        logger.error(f"Failed to broadcast revocation of token {jti}: {e}")
+
+
+async def _apply_revocation(message: dict) -> None:
+    token_denylist.add(message["jti"], float(message["exp"]))
+
+
+async def listen_for_revocations(retry_interval: float = 5.0) -> None:
+    """Apply revocations broadcast by other workers, reconnecting on failure."""
+    while True:
+        try:
+            await RabbitMQClient().consume_fanout(REVOCATION_EXCHANGE, _apply_revocation)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Revocation listener failed, retrying in {retry_interval}s: {e}")
+            await asyncio.sleep(retry_interval)
@@ -1,4 +1,7 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import jwt
 from jwt.exceptions import PyJWTError
@@ -7,8 +10,11 @@ from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException, UnauthorizedException
 from app.core.logging import get_logger
+from app.core.revocation import revoke_token, token_denylist
 from app.schemas.schemas import UserResponse
+from app.users.cache import is_token_version_current, user_cache
 
 logger = get_logger(__name__)
 
@@ -17,16 +23,64 @@ pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
-def verify_password(plain_password:str, password_hash:str)-> bool:
+# Argon2 计算会阻塞事件循环，放到独立的线程/进程池中执行
+_hash_executor: Executor | None = None
+_hash_pending = 0
+
+
+def _verify(plain_password: str, password_hash: str) -> bool:
     return pwd_context.verify(plain_password, password_hash)
 
 
-def get_password_hash(password:str)->str:
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _get_hash_executor() -> Executor:
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2"
+            )
+    return _hash_executor
+
+
+async def _run_hash_job(func, *args):
+    """Run a hashing function in the pool, shedding load when the queue is full."""
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        logger.warning(f"Password hash queue full ({_hash_pending} pending), rejecting request")
+        raise ServiceUnavailableException("Too many authentication requests, try again later")
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+def shutdown_hash_executor() -> None:
+    """Shut down the hashing pool, if it was started."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
+async def verify_password(plain_password:str, password_hash:str)-> bool:
+    return await _run_hash_job(_verify, plain_password, password_hash)
+
+
+async def get_password_hash(password:str)->str:
+    return await _run_hash_job(_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None)->str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -35,12 +89,79 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None)->str
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_EXPIRATION)
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid4().hex)
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
     )
     return encoded_jwt
 
 
+def _user_claims(user) -> dict:
+    """Claims identifying a user in access and refresh tokens."""
+    data = {"sub": str(user.username)}
+    if settings.JWT_STATELESS:
+        data.update(
+            {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "full_name": user.full_name,
+                "ver": user.version,
+            }
+        )
+    return data
+
+
+def create_user_access_token(user, expires_delta: timedelta | None = None) -> str:
+    """Create an access token for a user.
+
+    With JWT_STATELESS enabled the token also carries the claims needed to
+    rebuild the current user without a database lookup.
+    """
+    return create_access_token(data=_user_claims(user), expires_delta=expires_delta)
+
+
+def create_refresh_token(user) -> tuple[str, str, datetime]:
+    """Create a refresh token for a user.
+
+    Returns:
+        tuple[str, str, datetime]: the encoded token, its jti and its expiry.
+    """
+    jti = uuid4().hex
+    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.JWT_REFRESH_EXPIRATION)
+    to_encode = _user_claims(user)
+    to_encode.update({"id": user.id, "jti": jti, "type": "refresh", "exp": expire})
+    encoded_jwt = jwt.encode(
+        to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
+    )
+    return encoded_jwt, jti, expire
+
+
+def decode_refresh_token(token: str) -> dict:
+    """Verify a refresh token's signature and expiry and return its claims."""
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except PyJWTError:
+        raise UnauthorizedException("Invalid refresh token")
+    if payload.get("type") != "refresh" or "jti" not in payload or "id" not in payload:
+        raise UnauthorizedException("Invalid refresh token")
+    return payload
+
+
+async def revoke_access_token(token: str) -> None:
+    """Revoke an access token until it expires. Invalid tokens are ignored."""
+    try:
+        payload = jwt.decode(
+            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
+        )
+    except PyJWTError:
+        return
+    if "jti" in payload and "exp" in payload:
+        await revoke_token(payload["jti"], payload["exp"])
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme)
 ) -> UserResponse:
@@ -58,10 +179,29 @@ async def get_current_user(
         username: str = payload.get(
             "sub"
         )  # "sub" 是 JWT 的标准字段，通常用于存储主体标识
-        if username is None:
-            raise credentials_exception        
+        if username is None or payload.get("type") == "refresh":
+            raise credentials_exception
+        # 已吊销的令牌：纯内存 O(1) 检查
+        if payload.get("jti") in token_denylist:
+            raise credentials_exception
     except PyJWTError:
         raise credentials_exception
+
+    # 无状态令牌：直接从声明构建用户，只做内存中的版本检查
+    if settings.JWT_STATELESS and "id" in payload and "ver" in payload:
+        if not await is_token_version_current(payload["id"], payload["ver"]):
+            raise credentials_exception
+        return UserResponse(
+            id=payload["id"],
+            username=payload["username"],
+            email=payload["email"],
+            full_name=payload.get("full_name"),
+        )
+
+    if settings.USER_CACHE_ENABLED:
+        cached_user = user_cache.get(username)
+        if cached_user is not None:
+            return cached_user
     
     # Import here to avoid circular imports
     from app.core.database import get_db
@@ -71,4 +211,7 @@ async def get_current_user(
         user = await UserService(session).get_user_by_username(username)
         if user is None:
             raise credentials_exception
+        user = UserResponse.model_validate(user)
+        if settings.USER_CACHE_ENABLED:
+            user_cache.set(username, user)
         return user
\ No newline at end of file
@@ -0,0 +1,163 @@
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.database import DB_ECHO, SQLITE_DATABASE_URL, SQLITE_PRAGMAS, apply_sqlite_pragmas
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+WriteOp = Callable[[AsyncSession], Awaitable[T]]
+
+
+def _fail(batch: list[tuple[WriteOp, asyncio.Future]], error: BaseException) -> None:
+    """Fail the callers of a batch that have not been resolved yet."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+class DatabaseWriter:
+    """Single writer for the SQLite database with group commit.
+
+    Write operations are coroutines that take a session and must not commit.
+    They are queued and applied in batches of up to ``max_batch``, each batch
+    inside one transaction on the writer's own connection. Every operation
+    runs in a SAVEPOINT, so a failing operation is rolled back alone and
+    only its caller sees the error. Callers are resolved after the shared
+    commit.
+    """
+
+    def __init__(self, url: str, max_batch: int = 64, max_queue: int = 1024):
+        self.max_batch = max_batch
+        self.engine = create_async_engine(url, echo=DB_ECHO, pool_size=1, max_overflow=0)
+        self.session_factory = async_sessionmaker(
+            class_=AsyncSession, expire_on_commit=False, bind=self.engine
+        )
+        self.max_queue = max_queue
+        self._queue: asyncio.Queue[tuple[WriteOp, asyncio.Future]] | None = None
+        self._task: asyncio.Task | None = None
+        self.batches = 0
+        self.operations = 0
+
+        @event.listens_for(self.engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, SQLITE_PRAGMAS)
+            # 由 SQLAlchemy 自行发出 BEGIN，SAVEPOINT 才能正常工作
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(self.engine.sync_engine, "begin")
+        def _on_begin(conn):
+            # 事务开始即持有写锁，避免读锁升级时的死锁
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            # 队列绑定当前事件循环，因此在启动时创建
+            self._queue = asyncio.Queue(self.max_queue)
+            self._task = asyncio.create_task(self._run())
+            logger.info("Database writer started")
+
+    async def stop(self) -> None:
+        """Stop the writer, failing the operations in flight and still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _fail([self._queue.get_nowait()], RuntimeError("Database writer stopped"))
+        await self.engine.dispose()
+        logger.info("Database writer stopped")
+
+    async def submit(self, op: WriteOp[T]) -> T:
+        """Queue a write operation and wait until its batch has committed."""
+        if not self.running:
+            raise RuntimeError("Database writer is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "operations": self.operations,
+            "avg_batch_size": self.operations / self.batches if self.batches else 0.0,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._apply(batch)
+            except asyncio.CancelledError:
+                # 停止时正在执行的批次随事务回滚，其调用方不能一直等待
+                _fail(batch, RuntimeError("Database writer stopped"))
+                raise
+
+    async def _apply(self, batch: list[tuple[WriteOp, asyncio.Future]]) -> None:
+        outcomes: list[tuple[bool, Any]] = []
+        try:
+            async with self.session_factory() as session:
+                async with session.begin():
+                    for op, future in batch:
+                        if future.cancelled():
+                            outcomes.append((False, None))
+                            continue
+                        try:
+                            async with session.begin_nested():
+                                outcomes.append((True, await op(session)))
+                        except Exception as e:
+                            outcomes.append((False, e))
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} operations failed: {e}")
+            _fail(batch, e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+writer = DatabaseWriter(
+    SQLITE_DATABASE_URL,
+    max_batch=settings.DB_WRITER_MAX_BATCH,
+    max_queue=settings.DB_WRITER_MAX_QUEUE,
+)
+
+
+async def run_write(session: AsyncSession, op: WriteOp[T]) -> T:
+    """Run a write operation and commit it.
+
+    With DB_WRITER_ENABLED the operation is queued for group commit;
+    otherwise it runs on the caller's session, which is committed, or rolled
+    back on error.
+    """
+    if settings.DB_WRITER_ENABLED:
+        return await writer.submit(op)
+    try:
+        result = await op(session)
+        await session.commit()
+        return result
+    except Exception:
+        await session.rollback()
+        raise
@@ -1,10 +1,20 @@
-from fastapi import FastAPI, Response
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.invalidation import invalidation_bus
 from app.core.logging import setup_logging
+from app.core.revocation import listen_for_revocations
+from app.core.security import get_current_user, shutdown_hash_executor
+from app.core.writer import writer
+from app.service.cache import response_cache
+from app.service.list_service import run_list_stats_reconciler
+from app.users.cache import user_cache
 from app.users import routes
-from app.routers import lists_routes, todos_route, notification
+from app.routers import dashboard, lists_routes, todos_route, notification
 from app.utils.migrations import run_migrations
 
 
@@ -16,7 +26,32 @@ setup_logging()
 run_migrations()
 
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_WRITER_ENABLED:
+        writer.start()
+    revocation_listener = asyncio.create_task(listen_for_revocations())
+    invalidation_listener = asyncio.create_task(invalidation_bus.listen())
+    reconciler = None
+    if settings.LIST_STATS_RECONCILE_INTERVAL > 0:
+        reconciler = asyncio.create_task(
+            run_list_stats_reconciler(settings.LIST_STATS_RECONCILE_INTERVAL)
+        )
+    yield
+    if reconciler is not None:
+        reconciler.cancel()
+        with suppress(asyncio.CancelledError):
+            await reconciler
+    if settings.DB_WRITER_ENABLED:
+        await writer.stop()
+    for listener in (revocation_listener, invalidation_listener):
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    shutdown_hash_executor()
+
+
+app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -32,9 +67,22 @@ app.include_router(routes.router)  # Users Router
 app.include_router(lists_routes.router)
 app.include_router(todos_route.router)
 app.include_router(notification.router)
+app.include_router(dashboard.router)
 
 
 @app.get("/health")
 async def health_check(response: Response):
     response.status_code = 200
     return {"status": "ok 👍 "}
+
+
+# 当前 worker 的运行指标，生产环境同样需要；只对登录用户开放
+@app.get("/stats", dependencies=[Depends(get_current_user)])
+async def get_stats():
+    """In-process cache, invalidation bus and writer statistics of this worker."""
+    return {
+        "response_cache": response_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "invalidation_bus": invalidation_bus.stats(),
+        "db_writer": writer.stats(),
+    }
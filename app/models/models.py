@@ -2,7 +2,7 @@ from typing import Optional
 from datetime import datetime, timezone
 import enum
 
-from sqlalchemy import String, Text, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy import String, Text, Enum, Computed, ForeignKey, Index, UniqueConstraint, column, table
 from sqlalchemy.orm import Mapped, mapped_column, relationship, DeclarativeBase
 
 
@@ -12,6 +12,13 @@ class Priority(enum.Enum):
     high = 3
 
 
+# priority 按枚举名存储，直接排序是字母序（high < low < medium）；
+# 排序使用按枚举值计算的 priority_rank
+PRIORITY_RANK = "CASE priority {} END".format(
+    " ".join(f"WHEN '{priority.name}' THEN {priority.value}" for priority in Priority)
+)
+
+
 # 基础类
 class Base(DeclarativeBase):
     pass
@@ -29,6 +36,10 @@ class User(Base):
     )
     password_hash: Mapped[Optional[str]] = mapped_column(String(256))
     full_name: Mapped[Optional[str]] = mapped_column(String(64))
+    # 每次更新自增，用于使无状态令牌失效
+    version: Mapped[int] = mapped_column(default=1, server_default="1", nullable=False)
+    # 列表和待办每次写入自增，用于生成 ETag
+    data_version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
 
     # 一对多关系：User -> List
     lists: Mapped[list["TodoList"]] = relationship(
@@ -39,6 +50,8 @@ class User(Base):
         "Todos", back_populates="owner", cascade="all, delete-orphan"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class TodoList(Base):
     __tablename__ = "lists"
@@ -58,7 +71,11 @@ class TodoList(Base):
 
     # 一对多关系：List -> Todo
     todos: Mapped[list["Todos"]] = relationship(
-        "Todos", back_populates="list", cascade="all, delete-orphan", lazy="selectin"
+        "Todos",
+        back_populates="list",
+        cascade="all, delete-orphan",
+        lazy="raise",  # 列表接口只返回汇总，待办需显式分页查询
+        passive_deletes=True,  # 由数据库 ON DELETE CASCADE 删除子项
     )
 
     # 表级约束：确保每个用户的列表标题唯一
@@ -79,14 +96,18 @@ class Todos(Base):
         comment="Priority, 1-low, 2-medium, 3-high",
     )
     created_at: Mapped[datetime] = mapped_column(
-        index=True, default=lambda: datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc)
     )
-    completed: Mapped[bool] = mapped_column(default=False, index=True, nullable=False)
+    completed: Mapped[bool] = mapped_column(default=False, nullable=False)
+    # 虚拟生成列，不占存储，只在索引中物化
+    priority_rank: Mapped[int] = mapped_column(Computed(PRIORITY_RANK, persisted=False))
     # 外键：关联到 List 表
     list_id: Mapped[int] = mapped_column(
-        ForeignKey("lists.id"), index=True, nullable=False
+        ForeignKey("lists.id", ondelete="CASCADE"), nullable=False
     )
     # 外键：关联到 User 表
+    # 单列索引实际是 (user_id, rowid)，无 order_by 的列表按 id 排序全靠它；
+    # 复合索引只能定位 user_id，之后仍需 TEMP B-TREE 排序，不能删除
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"), index=True, nullable=False
     )
@@ -95,3 +116,55 @@ class Todos(Base):
     list: Mapped["TodoList"] = relationship("TodoList", back_populates="todos")
     # 多对一关系：Todo -> User
     owner: Mapped["User"] = relationship("User", back_populates="todos")
+
+    # 复合索引：等值过滤列在前，排序列在后，避免临时 B 树排序。
+    # 列表属于单个用户，按 list_id 过滤时无需再带 user_id。
+    __table_args__ = (
+        Index("ix_todos_list_user", "list_id", "user_id"),
+        Index("ix_todos_user_created_at", "user_id", "created_at"),
+        Index("ix_todos_user_priority_rank", "user_id", "priority_rank"),
+        Index("ix_todos_user_completed_created_at", "user_id", "completed", "created_at"),
+        Index("ix_todos_user_completed_priority_rank", "user_id", "completed", "priority_rank"),
+        Index("ix_todos_list_created_at", "list_id", "created_at"),
+        Index("ix_todos_list_priority_rank", "list_id", "priority_rank"),
+        Index("ix_todos_list_completed_created_at", "list_id", "completed", "created_at"),
+        Index("ix_todos_list_completed_priority_rank", "list_id", "completed", "priority_rank"),
+    )
+
+
+class ListStats(Base):
+    """Denormalized todo counters of a list.
+
+    Kept in step with ``todos`` by triggers created in the migration, so
+    every write path (including bulk statements and cascades) updates them
+    in the same transaction.
+    """
+
+    __tablename__ = "list_stats"
+
+    list_id: Mapped[int] = mapped_column(
+        ForeignKey("lists.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    completed: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    # 每个 Priority 一列
+    low: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    medium: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+    high: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+
+
+# todos.content 的 FTS5 外部内容索引，由迁移创建并通过触发器同步。
+# 不属于 Base.metadata，仅用于构建查询。
+todos_fts = table("todos_fts", column("rowid"), column("rank"), column("todos_fts"))
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    # 令牌 ID (uuid4 hex)，主键即查询索引
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    # 外键：关联到 User 表
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
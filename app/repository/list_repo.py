@@ -1,17 +1,94 @@
-from sqlalchemy import select
+from typing import Sequence
+
+from sqlalchemy import Row, Select, case, delete, func, insert, literal, or_, select, true, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AlreadyExistsException, NotFoundException
-from app.models.models import TodoList, Todos
+from app.core.writer import run_write
+from app.repository.read_models import (
+    LIST_COLUMNS,
+    LIST_RETURNING_COLUMNS,
+    LIST_STATS_FIELDS,
+    TODO_COLUMNS,
+    select_columns,
+)
+from app.utils.etag import bump_data_version
+from app.models.models import ListStats, Priority, TodoList, Todos, User
 from app.schemas.schemas import ListCreate, ListUpdate, TodoCreate
+from app.utils.pagination import order_todos, page_fields
+
+
+# list_stats 中的计数列：总数、已完成数、各优先级数量
+STATS_COLUMNS = ("total", "completed", *(priority.name for priority in Priority))
+
+
+def _summary_query(current_user, fields: Sequence[str] | None = None) -> Select:
+    """Select list headers with their counters from list_stats, one row per list.
+
+    With ``fields`` only those columns are selected, and list_stats is only
+    joined when a counter was asked for.
+    """
+    columns = select_columns(LIST_COLUMNS, fields)
+    query = select(*columns).where(TodoList.user_id == current_user.id)
+    if fields is None or LIST_STATS_FIELDS.keys() & set(fields):
+        query = query.outerjoin(ListStats, ListStats.list_id == TodoList.id)
+    return query
+
+
+def _actual_stats_query(list_ids: Sequence[int] | None = None) -> Select:
+    """Recount the counters of every list, or only of ``list_ids``, from todos.
+
+    Like the triggers, only todos owned by the list's owner are counted.
+    """
+    counts = select(
+        Todos.list_id,
+        func.count().label("total"),
+        func.sum(case((Todos.completed == true(), 1), else_=0)).label("completed"),
+        *(
+            func.sum(case((Todos.priority == priority, 1), else_=0)).label(priority.name)
+            for priority in Priority
+        ),
+    ).join(
+        TodoList, (TodoList.id == Todos.list_id) & (TodoList.user_id == Todos.user_id)
+    ).group_by(Todos.list_id)
+    if list_ids is not None:
+        # 只重算指定列表，按 list_id 索引定位，不扫描全表
+        counts = counts.where(Todos.list_id.in_(list_ids))
+    counts = counts.subquery()
+    query = select(
+        TodoList.id.label("list_id"),
+        *(
+            func.coalesce(counts.c[name], 0).label(name)
+            for name in STATS_COLUMNS
+        ),
+    ).outerjoin(counts, counts.c.list_id == TodoList.id)
+    if list_ids is not None:
+        query = query.where(TodoList.id.in_(list_ids))
+    return query
+
+
+def _drifted_stats_query(list_ids: Sequence[int] | None = None) -> Select:
+    """Actual counters of the lists whose list_stats row is missing or wrong."""
+    actual = _actual_stats_query(list_ids).subquery()
+    return (
+        select(actual)
+        .outerjoin(ListStats, ListStats.list_id == actual.c.list_id)
+        .where(
+            or_(
+                ListStats.list_id.is_(None),
+                *(getattr(ListStats, name) != actual.c[name] for name in STATS_COLUMNS),
+            )
+        )
+    )
 
 
 class TodoListRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def create(self, data: ListCreate, current_user) -> TodoList:
+    async def create(self, data: ListCreate, current_user) -> Row:
         """Create a new TodoList item.
 
         Args:
@@ -19,61 +96,73 @@ class TodoListRepository:
             data (ListCreate): title and description of the new list.
 
         Returns:
-            TodoList: newly created TodoList item.
+            Row: id, title, description and user_id of the new list.
 
         Raises:
             AlreadyExistsException: if a TodoList with the same title already exists.
         """
 
-        new_list = TodoList(
-            title=data.title, description=data.description, user_id=current_user.id
-        )
-        self.session.add(new_list)
-        try:
-            await self.session.commit()
-            await self.session.refresh(new_list)
-            return new_list
-        except IntegrityError:
-            await self.session.rollback()
-            raise AlreadyExistsException(
-                f"Todo list with title {data.title} already exists"
-            )
+        async def _create(session: AsyncSession) -> Row:
+            try:
+                result = await session.execute(
+                    insert(TodoList)
+                    .values(
+                        title=data.title,
+                        description=data.description,
+                        user_id=current_user.id,
+                    )
+                    .returning(
+                        TodoList.id, TodoList.title, TodoList.description, TodoList.user_id
+                    )
+                )
+            except IntegrityError:
+                raise AlreadyExistsException(
+                    f"Todo list with title {data.title} already exists"
+                )
+            await bump_data_version(session, current_user.id)
+            return result.one()
 
-    async def get_by_id(self, list_id: int, current_user) -> TodoList:
-        """Get a TodoList by ID for the current user.
+        return await run_write(self.session, _create)
+
+    async def get_by_id(self, list_id: int, current_user) -> Row:
+        """Get a TodoList summary by ID for the current user.
 
         Args:
             list_id: The ID of the TodoList.
-            current_user_id: The ID of the current user.
+            current_user (User): current user.
 
         Returns:
-            Optional[TodoList]: The TodoList if found, otherwise None.
+            Row: the list's id, title, description, user_id, todo_count and completed_count.
+
+        Raises:
+            NotFoundException: If the TodoList is not found or does not belong to the current user.
         """
-        query = (
-            select(TodoList).where(
-                TodoList.id == list_id, TodoList.user_id == current_user.id
-            )
-            # .options(selectinload(TodoList.todos))  #  models里定义了lazy属性就无需这条
+        result = await self.session.execute(
+            _summary_query(current_user).where(TodoList.id == list_id)
         )
-        result = await self.session.scalars(query)
         list_ = result.one_or_none()
         if not list_:
             raise NotFoundException(f"TodoList with id {list_id} not found")
         return list_
 
-    async def get_all(self, current_user) -> list[TodoList]:
-        """Get all lists.
+    async def get_all(
+        self, current_user, fields: Sequence[str] | None = None
+    ) -> list[Row]:
+        """Get summaries of all lists of the current user.
+
+        Args:
+            current_user (User): current user.
+            fields (Sequence[str] | None): Columns to select, all by default.
 
         Returns:
-            List[TodoList]: List of all todo lists.
+            list[Row]: id, title, description, user_id, todo_count and completed_count of each list.
         """
-        result = await self.session.scalars(
-            select(TodoList).where(TodoList.user_id == current_user.id)
-            # .options(selectinload(TodoList.todos))  # 可用selectinload subqueryload
+        result = await self.session.execute(
+            _summary_query(current_user, fields).order_by(TodoList.id)
         )
         return result.all()
 
-    async def update(self, list_id: int, data: ListUpdate, current_user) -> TodoList:
+    async def update(self, list_id: int, data: ListUpdate, current_user) -> Row:
         """Update an existing TodoList item for the current user.
 
         Args:
@@ -82,32 +171,42 @@ class TodoListRepository:
             current_user (User): The current user performing the update.
 
         Returns:
-            TodoList: The updated TodoList item.
+            Row: summary of the updated TodoList, as returned by get_by_id.
 
         Raises:
             NotFoundException: If the TodoList is not found or does not belong to the current user.
             ValueError: If no fields are provided for update.
         """
-        query = select(TodoList).where(
-            TodoList.id == list_id, TodoList.user_id == current_user.id
-        )
-        result = await self.session.scalars(query)
-        list_item = result.one_or_none()
-        if not list_item:
-            raise NotFoundException(
-                f"TodoList with id {list_id} not found or does not belong to the current user"
-            )
         update_data = data.model_dump(exclude_unset=True, exclude_none=True)
         # 确保不修改 id 和 user_id
         update_data.pop("id", None)
         update_data.pop("user_id", None)
         if not update_data:
             raise ValueError("No fields to update")
-        for key, value in update_data.items():
-            setattr(list_item, key, value)
-        await self.session.commit()
-        await self.session.refresh(list_item)
-        return list_item
+
+        async def _update(session: AsyncSession) -> Row:
+            # 单条 UPDATE ... RETURNING 同时返回计数，与 get_by_id 的汇总相同
+            try:
+                result = await session.execute(
+                    update(TodoList)
+                    .where(TodoList.id == list_id, TodoList.user_id == current_user.id)
+                    .values(**update_data)
+                    .returning(*LIST_RETURNING_COLUMNS)
+                    .execution_options(synchronize_session=False)
+                )
+            except IntegrityError:
+                raise AlreadyExistsException(
+                    f"Todo list with title {update_data.get('title')} already exists"
+                )
+            summary = result.one_or_none()
+            if summary is None:
+                raise NotFoundException(
+                    f"TodoList with id {list_id} not found or does not belong to the current user"
+                )
+            await bump_data_version(session, current_user.id)
+            return summary
+
+        return await run_write(self.session, _update)
 
     async def delete(self, list_id: int, current_user) -> None:
         """Delete an existing TodoList item for the current user.
@@ -119,13 +218,19 @@ class TodoListRepository:
         Raises:
             NotFoundException: If the TodoList is not found or does not belong to the current user.
         """
-        list = await self.session.get(TodoList, list_id)
-
-        if not list or list.user_id != current_user.id:
-            raise NotFoundException(f"TodoList with id {list_id} not found")
+        async def _delete(session: AsyncSession) -> None:
+            # 单条 DELETE，子项由外键 ON DELETE CASCADE 在数据库内删除
+            result = await session.execute(
+                delete(TodoList)
+                .where(TodoList.id == list_id, TodoList.user_id == current_user.id)
+                .returning(TodoList.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.scalar_one_or_none() is None:
+                raise NotFoundException(f"TodoList with id {list_id} not found")
+            await bump_data_version(session, current_user.id)
 
-        await self.session.delete(list)  # 触发 ORM 级联删除
-        await self.session.commit()
+        await run_write(self.session, _delete)
 
     async def create_todo(self, list_id: int, data: TodoCreate, current_user) -> Todos:
         """Create a new TodoItem in a specific list for the current user.
@@ -139,37 +244,149 @@ class TodoListRepository:
             Todos: newly created TodoItem item.
 
         Raises:
-            AlreadyExistsException: if a TodoItem with the same title already exists.
+            NotFoundException: If the TodoList is not found or does not belong to the current user.
         """
 
-        new_todo = Todos(
-            content=data.content,
-            priority=data.priority,
-            list_id=list_id,
-            user_id=current_user.id,
-        )
-        self.session.add(new_todo)
-        try:
-            await self.session.commit()
-            await self.session.refresh(new_todo)
-            return new_todo
-        except SQLAlchemyError as e:
-            await self.session.rollback()
-            raise Exception(f"Database operation failed, create failed {e}")
-
-    async def get_todos_by_list_id(self, list_id: int, current_user) -> list[Todos]:
-        """Get all TodoItems for the current user in a specific list.
+        async def _create_todo(session: AsyncSession) -> Todos:
+            # INSERT ... SELECT FROM lists：列表不存在或不属于当前用户时不插入任何行，
+            # 一条语句完成归属校验和写入
+            owned_list = select(
+                literal(data.content, Todos.content.type),
+                literal(data.priority, Todos.priority.type),
+                TodoList.id,
+                TodoList.user_id,
+            ).where(TodoList.id == list_id, TodoList.user_id == current_user.id)
+            try:
+                result = await session.scalars(
+                    insert(Todos)
+                    .from_select(["content", "priority", "list_id", "user_id"], owned_list)
+                    .returning(Todos)
+                )
+            except SQLAlchemyError as e:
+                raise Exception(f"Database operation failed, create failed {e}")
+            todo = result.one_or_none()
+            if todo is None:
+                raise NotFoundException(f"TodoList with id {list_id} not found")
+            await bump_data_version(session, current_user.id)
+            return todo
+
+        return await run_write(self.session, _create_todo)
+
+    async def create_todos(
+        self, list_id: int, items: list[TodoCreate], current_user
+    ) -> list[Todos]:
+        """Create several TodoItems in a specific list in one transaction.
+
+        Args:
+            list_id (int): The ID of the TodoList to create the TodoItems in.
+            items (list[TodoCreate]): content and priority of each new TodoItem.
+            current_user (User): current user.
+
+        Returns:
+            list[Todos]: the created TodoItems, in the order given.
+
+        Raises:
+            NotFoundException: If the TodoList is not found or does not belong to the current user.
+        """
+
+        async def _create_todos(session: AsyncSession) -> list[Todos]:
+            owned = await session.scalar(
+                select(TodoList.id).where(
+                    TodoList.id == list_id, TodoList.user_id == current_user.id
+                )
+            )
+            if owned is None:
+                raise NotFoundException(f"TodoList with id {list_id} not found")
+            # 多行 INSERT ... RETURNING，一条语句写入并取回全部行
+            result = await session.scalars(
+                insert(Todos).returning(Todos),
+                [
+                    {
+                        "content": item.content,
+                        "priority": item.priority,
+                        "list_id": list_id,
+                        "user_id": current_user.id,
+                    }
+                    for item in items
+                ],
+            )
+            await bump_data_version(session, current_user.id)
+            # RETURNING 不保证顺序；同一语句内 id 按插入顺序递增
+            return sorted(result.all(), key=lambda todo: todo.id)
+
+        return await run_write(self.session, _create_todos)
+
+    async def get_todos_by_list_id(
+        self,
+        list_id: int,
+        current_user,
+        order_by: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Sequence[Row]:
+        """Get all TodoItems for the current user in a specific list, as read-model rows.
 
         Args:
             list_id (int): The ID of the list to retrieve TodoItems from.
             current_user (User): The current user requesting the TodoItems.
+            order_by (str | None): Sort order, e.g. "created_at desc".
+            limit (int | None): Page size; at most ``limit + 1`` rows are returned.
+            cursor (str | None): Cursor of the page to fetch.
+            fields (Sequence[str] | None): Columns to select, all by default.
+                The columns a page cursor needs are always selected.
 
         Returns:
-            list[Todos]: List of all TodoItems in the list.
+            Sequence[Row]: The TodoItems in the list, with the columns of TodoResponse.
         """
-        query = select(Todos).where(
+        required = page_fields(order_by) if limit is not None else ()
+        query = select(*select_columns(TODO_COLUMNS, fields, required)).where(
             Todos.list_id == list_id, Todos.user_id == current_user.id
         )
-        result = await self.session.scalars(query)
-        todos = result.all()
-        return todos
+        query = order_todos(query, order_by, cursor=cursor, limit=limit)
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def reconcile_stats(self) -> list[int]:
+        """Recount list_stats from todos and repair any rows that drifted.
+
+        Drift is detected with a read, so the full recount never holds the
+        write lock. Only the drifted lists are then recounted and upserted
+        in the write; the drift condition is checked again there, so
+        writes that landed in between are neither lost nor reported.
+
+        Returns:
+            list[int]: IDs of the lists whose counters were repaired.
+        """
+        drifted = _drifted_stats_query().subquery()
+        list_ids = list((await self.session.scalars(select(drifted.c.list_id))).all())
+        # 结束读事务，之后的写入不必把读锁升级为写锁
+        await self.session.rollback()
+        if not list_ids:
+            return []
+
+        stmt = sqlite_insert(ListStats).from_select(
+            ["list_id", *STATS_COLUMNS], _drifted_stats_query(list_ids)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ListStats.list_id],
+            set_={name: stmt.excluded[name] for name in STATS_COLUMNS},
+        ).returning(ListStats.list_id)
+
+        async def _reconcile(session: AsyncSession) -> list[int]:
+            repaired = list((await session.scalars(stmt)).all())
+            if repaired:
+                # 计数变化后，相关用户的 ETag 也需失效
+                await session.execute(
+                    update(User)
+                    .where(
+                        User.id.in_(
+                            select(TodoList.user_id).where(TodoList.id.in_(repaired))
+                        )
+                    )
+                    .values(data_version=User.data_version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+            return repaired
+
+        return await run_write(self.session, _reconcile)
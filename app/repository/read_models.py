@@ -0,0 +1,101 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy import String, func, literal_column, select, type_coerce
+
+from app.core.exceptions import BadRequestException
+from app.models.models import ListStats, TodoList, Todos
+from app.schemas.schemas import ListResponse, TodoResponse
+
+
+# 读模型：只选取响应需要的列，结果是轻量的 Row（具名元组），
+# 不创建 ORM 实体、不进入 identity map，也不触发关系加载。
+# 列顺序与 TodoResponse 的字段顺序一致，Row._asdict() 可直接序列化。
+def _todo_column(name: str):
+    if name == "priority":
+        # 库中保存的就是枚举名，跳过 Enum 类型的逐行转换
+        return type_coerce(Todos.priority, String).label("priority")
+    return getattr(Todos, name)
+
+
+# 字段白名单直接取自响应模型，新增字段时无需同步维护
+TODO_FIELDS = tuple(TodoResponse.model_fields)
+TODO_COLUMNS = {name: _todo_column(name) for name in TODO_FIELDS}
+TODO_ROW_COLUMNS = tuple(TODO_COLUMNS.values())
+
+
+# 列表汇总：表头列加上 list_stats 中的计数（没有统计行时为 0）
+LIST_STATS_FIELDS = {
+    "todo_count": ListStats.total,
+    "completed_count": ListStats.completed,
+    "low_count": ListStats.low,
+    "medium_count": ListStats.medium,
+    "high_count": ListStats.high,
+}
+
+
+def _list_column(name: str):
+    if name in LIST_STATS_FIELDS:
+        return func.coalesce(LIST_STATS_FIELDS[name], 0).label(name)
+    return getattr(TodoList, name)
+
+
+# todos 是嵌套的一页待办，不是列表表中的列
+LIST_FIELDS = tuple(name for name in ListResponse.model_fields if name != "todos")
+LIST_COLUMNS = {name: _list_column(name) for name in LIST_FIELDS}
+LIST_ROW_COLUMNS = tuple(LIST_COLUMNS.values())
+
+
+def _list_returning_column(name: str):
+    if name in LIST_STATS_FIELDS:
+        # SQLite 方言在 RETURNING 中不带表名渲染列（list_id = id），
+        # 显式写出 lists.id，子查询才明确关联到被更新的行
+        counter = (
+            select(LIST_STATS_FIELDS[name])
+            .where(ListStats.list_id == literal_column(f"{TodoList.__tablename__}.id"))
+            .scalar_subquery()
+        )
+        return func.coalesce(counter, 0).label(name)
+    return getattr(TodoList, name)
+
+
+# UPDATE lists ... RETURNING 直接返回与 LIST_ROW_COLUMNS 相同的汇总行
+LIST_RETURNING_COLUMNS = tuple(_list_returning_column(name) for name in LIST_FIELDS)
+
+
+def parse_fields(fields: str | None, allowed: Sequence[str]) -> tuple[str, ...] | None:
+    """Parse a comma-separated ``fields`` parameter against an allowlist.
+
+    Args:
+        fields (str | None): e.g. "id,content,completed".
+        allowed (Sequence[str]): the selectable fields, in response order.
+
+    Returns:
+        tuple[str, ...] | None: the requested fields in response order, or
+        None when every field is wanted.
+
+    Raises:
+        BadRequestException: if a field is not in the allowlist.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise BadRequestException(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+        )
+    if len(requested) == len(allowed):
+        return None
+    return tuple(name for name in allowed if name in requested)
+
+
+def select_columns(
+    columns: dict, fields: Sequence[str] | None, required: Iterable[str] = ()
+) -> tuple:
+    """Columns of the requested fields plus those needed internally, in response order."""
+    if fields is None:
+        return tuple(columns.values())
+    wanted = set(fields).union(required)
+    return tuple(column for name, column in columns.items() if name in wanted)
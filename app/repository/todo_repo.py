@@ -1,9 +1,46 @@
-from sqlalchemy import select, desc, asc
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import ColumnElement, Row, Select, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundException
-from app.models.models import Todos
-from app.schemas.schemas import TodoUpdate
+from app.core.writer import run_write
+from app.models.models import TodoList, Todos, todos_fts
+from app.repository.read_models import TODO_COLUMNS, TODO_ROW_COLUMNS, select_columns
+from app.schemas.schemas import TodoBulkChanges, TodoFilter, TodoUpdate
+from app.utils.etag import bump_data_version
+from app.utils.pagination import order_todos, page_fields
+
+
+# trigram 索引只能回答至少三个字符的词
+MIN_FTS_TERM_LENGTH = 3
+
+
+def _fts_query(search: str) -> str | None:
+    """Turn user input into an FTS5 query: every term must occur as a substring.
+
+    Terms shorter than MIN_FTS_TERM_LENGTH are left out; see _short_term_conditions.
+    """
+    terms = [
+        term.replace('"', '""')
+        for term in search.split()
+        if len(term) >= MIN_FTS_TERM_LENGTH
+    ]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _short_term_conditions(search: str) -> list[ColumnElement[bool]]:
+    """Substring filters for the terms too short for the trigram index."""
+    return [
+        Todos.content.ilike(
+            "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%",
+            escape="\\",
+        )
+        for term in search.split()
+        if len(term) < MIN_FTS_TERM_LENGTH
+    ]
 
 
 class TodosRepository:
@@ -12,64 +49,183 @@ class TodosRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_by_id(self, todo_id: int, current_user) -> Todos:
-        """Get a TodoItem by ID for the current user.
+    async def get_by_id(
+        self, todo_id: int, current_user, fields: Sequence[str] | None = None
+    ) -> Row:
+        """Get a TodoItem by ID for the current user, as a read-model row.
 
         Args:
-            list_id (int): The ID of the TodoItem to retrieve.
+            todo_id (int): The ID of the TodoItem to retrieve.
             current_user (User): The current user requesting the TodoItem.
+            fields (Sequence[str] | None): Columns to select, all by default.
 
         Returns:
-            Todos: The TodoItem if found.
+            Row: The TodoItem if found, with the columns of TodoResponse.
 
         Raises:
             NotFoundException: If the TodoItem is not found or does not belong to the current user.
         """
 
-        query = select(Todos).where(
+        query = select(*select_columns(TODO_COLUMNS, fields)).where(
             Todos.id == todo_id, Todos.user_id == current_user.id
         )
-        result = await self.session.scalars(query)
+        result = await self.session.execute(query)
         todo = result.one_or_none()
         if not todo:
             raise NotFoundException(f"TodoItem with id {todo_id} not found")
         return todo
 
-    async def get_all(
+    async def get_many(
+        self, ids: Sequence[int], current_user, fields: Sequence[str] | None = None
+    ) -> Sequence[Row]:
+        """Get the current user's todos among ``ids`` in one query, as read-model rows.
+
+        Args:
+            ids (Sequence[int]): The IDs of the TodoItems to retrieve.
+            current_user (User): The current user requesting the TodoItems.
+            fields (Sequence[str] | None): Columns to select, all by default.
+                ``id`` is always selected.
+
+        Returns:
+            Sequence[Row]: The TodoItems found, in no particular order. IDs that
+            do not exist or belong to another user are simply absent.
+        """
+        columns = select_columns(TODO_COLUMNS, fields, ("id",))
+        query = select(*columns).where(
+            Todos.id.in_(ids), Todos.user_id == current_user.id
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    def _conditions(
         self,
         user_id: int,
         list_id: int | None = None,
         status: str | None = None,
         search: str | None = None,
-        order_by: str | None = None,
-    ) -> list[Todos]:
-        """Get todos based on filters."""
+    ) -> list[ColumnElement[bool]]:
+        """WHERE clauses for a user's todos with the given filters.
 
-        query = select(Todos).where(Todos.user_id == user_id)
+        ``search`` is only applied here as an ``id IN (fts match)`` subquery,
+        for statements that cannot join the FTS table (UPDATE/DELETE).
+        """
+        conditions = [Todos.user_id == user_id]
 
         if list_id:
-            query = query.where(Todos.list_id == list_id)
+            conditions.append(Todos.list_id == list_id)
 
         if status:
             if status == "finished":
-                query = query.where(Todos.completed.is_(True))
+                conditions.append(Todos.completed.is_(True))
             elif status == "unfinished":
-                query = query.where(Todos.completed.is_(False))
+                conditions.append(Todos.completed.is_(False))
 
+        if search and (match := _fts_query(search)):
+            conditions.append(
+                Todos.id.in_(
+                    select(todos_fts.c.rowid).where(todos_fts.c.todos_fts.op("MATCH")(match))
+                )
+            )
         if search:
-            query = query.where(Todos.content.ilike(f"%{search}%"))
-
-        if order_by:
-            if order_by == "created_at desc":
-                query = query.order_by(desc(Todos.created_at))
-            elif order_by == "created_at asc":
-                query = query.order_by(asc(Todos.created_at))
-            elif order_by == "priority desc":
-                query = query.order_by(desc(Todos.priority))
-            elif order_by == "priority asc":
-                query = query.order_by(asc(Todos.priority))
-
-        result = await self.session.scalars(query)
+            conditions.extend(_short_term_conditions(search))
+
+        return conditions
+
+    def _filtered_query(
+        self,
+        user_id: int,
+        list_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        columns: tuple = TODO_ROW_COLUMNS,
+    ) -> Select:
+        """Build the read-model SELECT for a user's todos with the given filters."""
+
+        query = select(*columns).where(*self._conditions(user_id, list_id, status))
+
+        if search and (match := _fts_query(search)):
+            query = query.join(todos_fts, todos_fts.c.rowid == Todos.id).where(
+                todos_fts.c.todos_fts.op("MATCH")(match)
+            )
+        if search:
+            # 短词在 user_id 等索引条件缩小范围后逐行匹配
+            query = query.where(*_short_term_conditions(search))
+
+        return query
+
+    def _ordered(
+        self,
+        query: Select,
+        search: str | None,
+        order_by: str | None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Select:
+        """Order by relevance for unpaginated searches without an explicit order."""
+        if search and _fts_query(search) and not order_by and limit is None and not cursor:
+            return query.order_by(todos_fts.c.rank, Todos.id)
+        return order_todos(query, order_by, cursor=cursor, limit=limit)
+
+    async def get_all(
+        self,
+        user_id: int,
+        list_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        order_by: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Sequence[Row]:
+        """Get todos based on filters, as read-model rows.
+
+        With a limit, returns at most ``limit + 1`` rows after the cursor
+        position; see ``app.utils.pagination.build_page``. With ``fields``
+        only those columns are selected, plus the ones a page cursor needs.
+        """
+
+        required = page_fields(order_by) if limit is not None else ()
+        columns = select_columns(TODO_COLUMNS, fields, required)
+        query = self._filtered_query(user_id, list_id, status, search, columns)
+        query = self._ordered(query, search, order_by, limit=limit, cursor=cursor)
+
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def stream_all(
+        self,
+        user_id: int,
+        list_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        order_by: str | None = None,
+        chunk_size: int = 500,
+        fields: Sequence[str] | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream todos based on filters in chunks of ``chunk_size`` read-model rows.
+
+        Rows are fetched from a server-side cursor, so only one chunk is held
+        in memory at a time. With ``fields`` only those columns are selected.
+        """
+
+        columns = select_columns(TODO_COLUMNS, fields)
+        query = self._filtered_query(user_id, list_id, status, search, columns)
+        query = self._ordered(query, search, order_by).execution_options(yield_per=chunk_size)
+
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_top_unfinished(self, user_id: int, limit: int) -> Sequence[Row]:
+        """Get a user's ``limit`` most important unfinished todos, as read-model rows.
+
+        Same order as ``order_by="priority desc"``: high > medium > low,
+        newest first within a priority. A single range scan of the
+        (user_id, completed, priority_rank) index reads at most ``limit`` rows.
+        """
+        query = self._filtered_query(user_id, status="unfinished")
+        query = order_todos(query, "priority desc").limit(limit)
+        result = await self.session.execute(query)
         return result.all()
 
     async def update(self, todo_id: int, data: TodoUpdate, current_user) -> Todos:
@@ -87,27 +243,31 @@ class TodosRepository:
             ValueError: If no fields are provided for update.
             NotFoundException: If the TodoItem is not found or does not belong to the current user.
         """
-        query = select(Todos).where(
-            Todos.id == todo_id, Todos.user_id == current_user.id
-        )
-        result = await self.session.scalars(query)
-        todo_item = result.one_or_none()
-        if not todo_item:
-            raise NotFoundException(
-                f"TodoItem with id {todo_id} not found or does not belong to the current user or list"
-            )
         update_data = data.model_dump(exclude_unset=True, exclude_none=True)
         # 确保不修改 list_id 和 user_id
         update_data.pop("list_id", None)
         update_data.pop("user_id", None)
         if not update_data:
             raise ValueError("No fields to update")
-        # 动态更新字段
-        for key, value in update_data.items():
-            setattr(todo_item, key, value)
-        await self.session.commit()
-        await self.session.refresh(todo_item)
-        return todo_item
+
+        async def _update(session: AsyncSession) -> Todos:
+            # 单条 UPDATE ... RETURNING，无需先查询再刷新
+            result = await session.scalars(
+                update(Todos)
+                .where(Todos.id == todo_id, Todos.user_id == current_user.id)
+                .values(**update_data)
+                .returning(Todos)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            todo_item = result.one_or_none()
+            if not todo_item:
+                raise NotFoundException(
+                    f"TodoItem with id {todo_id} not found or does not belong to the current user or list"
+                )
+            await bump_data_version(session, current_user.id)
+            return todo_item
+
+        return await run_write(self.session, _update)
 
     async def delete(self, todo_id: int, current_user) -> None:
         """Delete an existing TodoItem for the current user.
@@ -119,12 +279,112 @@ class TodosRepository:
         Raises:
             NotFoundException: If the TodoItem is not found or does not belong to the current user.
         """
-        query = select(Todos).where(
-            Todos.id == todo_id, Todos.user_id == current_user.id
-        )
-        result = await self.session.scalars(query)
-        todo_item = result.one_or_none()
-        if not todo_item:
-            raise NotFoundException(f"TodoItem with id {todo_id} not found")
-        await self.session.delete(todo_item)
-        await self.session.commit()
+        async def _delete(session: AsyncSession) -> None:
+            result = await session.execute(
+                delete(Todos)
+                .where(Todos.id == todo_id, Todos.user_id == current_user.id)
+                .returning(Todos.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.scalar_one_or_none() is None:
+                raise NotFoundException(f"TodoItem with id {todo_id} not found")
+            await bump_data_version(session, current_user.id)
+
+        await run_write(self.session, _delete)
+
+    def _bulk_conditions(
+        self, user_id: int, ids: list[int] | None, filter: TodoFilter | None
+    ) -> list[ColumnElement[bool]]:
+        """WHERE clauses selecting a user's todos by id set or by filter."""
+        if ids is not None:
+            return [Todos.user_id == user_id, Todos.id.in_(ids)]
+        if filter is None:
+            # 不允许隐式选中全部待办，见 TodoFilter.all
+            raise ValueError("Provide ids or a filter")
+        return self._conditions(user_id, filter.list_id, filter.status, filter.search)
+
+    async def bulk_update(
+        self,
+        current_user,
+        changes: TodoBulkChanges,
+        ids: list[int] | None = None,
+        filter: TodoFilter | None = None,
+    ) -> list[int]:
+        """Update many TodoItems of the current user with one UPDATE statement.
+
+        Args:
+            current_user (User): The current user performing the update.
+            changes (TodoBulkChanges): The fields to set on every matched TodoItem.
+            ids (list[int] | None): The IDs of the TodoItems to update.
+            filter (TodoFilter | None): Filter selecting the TodoItems when no IDs are given.
+
+        Returns:
+            list[int]: The IDs of the updated TodoItems.
+
+        Raises:
+            ValueError: If no fields are provided for update.
+            NotFoundException: If the target list does not belong to the current user.
+        """
+        update_data = changes.model_dump(exclude_unset=True, exclude_none=True)
+        update_data.pop("user_id", None)
+        if not update_data:
+            raise ValueError("No fields to update")
+        conditions = self._bulk_conditions(current_user.id, ids, filter)
+
+        async def _bulk_update(session: AsyncSession) -> list[int]:
+            if "list_id" in update_data:
+                owned = await session.scalar(
+                    select(TodoList.id).where(
+                        TodoList.id == update_data["list_id"],
+                        TodoList.user_id == current_user.id,
+                    )
+                )
+                if owned is None:
+                    raise NotFoundException(
+                        f"TodoList with id {update_data['list_id']} not found"
+                    )
+            result = await session.execute(
+                update(Todos)
+                .where(*conditions)
+                .values(**update_data)
+                .returning(Todos.id)
+                .execution_options(synchronize_session=False)
+            )
+            changed = list(result.scalars())
+            if changed:
+                await bump_data_version(session, current_user.id)
+            return changed
+
+        return await run_write(self.session, _bulk_update)
+
+    async def bulk_delete(
+        self,
+        current_user,
+        ids: list[int] | None = None,
+        filter: TodoFilter | None = None,
+    ) -> list[int]:
+        """Delete many TodoItems of the current user with one DELETE statement.
+
+        Args:
+            current_user (User): The current user performing the deletion.
+            ids (list[int] | None): The IDs of the TodoItems to delete.
+            filter (TodoFilter | None): Filter selecting the TodoItems when no IDs are given.
+
+        Returns:
+            list[int]: The IDs of the deleted TodoItems.
+        """
+        conditions = self._bulk_conditions(current_user.id, ids, filter)
+
+        async def _bulk_delete(session: AsyncSession) -> list[int]:
+            result = await session.execute(
+                delete(Todos)
+                .where(*conditions)
+                .returning(Todos.id)
+                .execution_options(synchronize_session=False)
+            )
+            changed = list(result.scalars())
+            if changed:
+                await bump_data_version(session, current_user.id)
+            return changed
+
+        return await run_write(self.session, _bulk_delete)
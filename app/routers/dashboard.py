@@ -0,0 +1,54 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+
+from app.core.logging import get_logger
+from app.core.security import get_current_user
+from app.service.dashboard_service import DashboardService
+from app.schemas.schemas import DashboardResponse, UserResponse
+from app.utils.etag import data_version
+
+
+# Set up logger for this module
+logger = get_logger(__name__)
+
+DASHBOARD_MAX_TODOS = 100
+
+
+router = APIRouter(tags=["Dashboard"], dependencies=[Depends(get_current_user)])
+
+
+def get_dashboard_service() -> DashboardService:
+    """Dependency for getting dashboard service instance."""
+    # 子查询各自打开会话，不使用请求级的 get_db 会话
+    return DashboardService()
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(
+    top: Annotated[
+        int, Query(ge=1, le=DASHBOARD_MAX_TODOS, description="Number of unfinished todos, highest priority first")
+    ] = 10,
+    recent: Annotated[
+        int, Query(ge=1, le=DASHBOARD_MAX_TODOS, description="Number of most recently created todos")
+    ] = 10,
+    version: int = Depends(data_version),
+    service: DashboardService = Depends(get_dashboard_service),
+    current_user: UserResponse = Depends(get_current_user),
+) -> DashboardResponse:
+    """
+    Get the user, their list summaries, the top unfinished todos and the
+    most recent todos in one request.
+
+    The parts are loaded concurrently. Responses carry an ETag; send it
+    back in `If-None-Match` to get a `304 Not Modified` while nothing has
+    changed.
+    """
+    try:
+        dashboard = await service.get_dashboard(
+            current_user=current_user, top=top, recent=recent, version=version
+        )
+        logger.info(f"Retrieved dashboard with {len(dashboard.lists)} lists")
+        return dashboard
+    except Exception as e:
+        logger.error(f"Failed to fetch dashboard: {str(e)}")
+        raise
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -6,7 +7,9 @@ from app.core.logging import get_logger
 from app.core.security import get_current_user
 from app.repository.list_repo import TodoListRepository
 from app.service.list_service import TodoListService
-from app.schemas.schemas import ListCreate, ListUpdate, ListResponse, TodoCreate, TodoResponse, UserResponse
+from app.schemas.schemas import ListCreate, ListUpdate, ListResponse, TodoBatchCreate, TodoCreate, TodoPage, TodoResponse, UserResponse
+from app.utils.etag import conditional_get, data_version
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 # Set up logger for this module
@@ -41,12 +44,33 @@ async def create_list(
 @router.get("/lists/{list_id}", response_model=ListResponse)
 async def get_list(
     list_id: int,
+    include: Annotated[
+        Literal["todos"] | None, Query(description="Also return a page of the list's todos")
+    ] = None,
+    order_by: Annotated[
+        str | None, Query(description="Order of the included todos (e.g., created_at desc/asc, priority desc/asc)")
+    ] = None,
+    limit: Annotated[
+        int | None, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size of the included todos")
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor of the previous page of todos")
+    ] = None,
+    version: int = Depends(data_version),
     service: TodoListService = Depends(get_list_service),
     current_user: UserResponse = Depends(get_current_user),
 ) -> ListResponse:
-    """Get list by id."""
+    """Get list summary by id, optionally with a page of its todos."""
     try:
-        list_ = await service.get_list(list_id=list_id, current_user=current_user)
+        list_ = await service.get_list(
+            list_id=list_id,
+            current_user=current_user,
+            include_todos=include == "todos",
+            order_by=order_by,
+            limit=limit,
+            cursor=cursor,
+            version=version,
+        )
         logger.info(f"Retrieved list {list_id}")
         return list_
     except Exception as e:
@@ -56,14 +80,22 @@ async def get_list(
 
 @router.get("/lists", response_model=list[ListResponse])
 async def get_all_lists(
+    fields: Annotated[
+        str | None, Query(description="Comma-separated list fields to return (e.g., id,title,todo_count)")
+    ] = None,
+    etag: str = Depends(conditional_get),
+    version: int = Depends(data_version),
     service: TodoListService = Depends(get_list_service),
     current_user: UserResponse = Depends(get_current_user),
-):
-    """Get all lists."""
+) -> Response:
+    """Get summaries of all lists, optionally only some of their fields."""
     try:
-        all_list = await service.get_lists(current_user=current_user)
-        logger.info(f"Retrieved {len(all_list)} lists")
-        return all_list
+        all_list = await service.get_lists(
+            current_user=current_user, fields=fields, version=version
+        )
+        logger.info(f"Retrieved lists ({len(all_list)} bytes)")
+        # 已编码的 JSON 直接返回，跳过 response_model 的再次校验与序列化
+        return Response(content=all_list, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to fetch all lists: {str(e)}")
         raise
@@ -86,17 +118,59 @@ async def create_todo(
         raise
 
 
-@router.get("/lists/{list_id}/todos", response_model=list[TodoResponse])
-async def get_todos_by_list_id(
+@router.post("/lists/{list_id}/todos:batch", response_model=list[TodoResponse], status_code=status.HTTP_201_CREATED)
+async def create_todos(
     list_id: int,
+    data: TodoBatchCreate,
     service: TodoListService = Depends(get_list_service),
     current_user: UserResponse = Depends(get_current_user),
 )->list[TodoResponse]:
+    """Create several todos in a specific list in one request."""
+    try:
+        created_todos = await service.create_todos(list_id=list_id, data=data, current_user=current_user)
+        logger.info(f"Created {len(created_todos)} todo items in list {list_id}")
+        return created_todos
+    except Exception as e:
+        logger.error(f"Failed to create todo items in list {list_id}: {str(e)}")
+        raise
+
+
+@router.get("/lists/{list_id}/todos", response_model=list[TodoResponse] | TodoPage)
+async def get_todos_by_list_id(
+    list_id: int,
+    order_by: Annotated[
+        str | None, Query(description="Order by field (e.g., created_at desc/asc, priority desc/asc)")
+    ] = None,
+    limit: Annotated[
+        int | None, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size, returns a paginated response")
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated todo fields to return (e.g., id,content,completed)")
+    ] = None,
+    etag: str = Depends(conditional_get),
+    version: int = Depends(data_version),
+    service: TodoListService = Depends(get_list_service),
+    current_user: UserResponse = Depends(get_current_user),
+)->Response:
     """Get all todos in specific list."""
+    if cursor and limit is None:
+        limit = DEFAULT_PAGE_SIZE
     try:
-        todos = await service.get_todos_in_list(list_id=list_id, current_user=current_user)
-        logger.info(f"Retrieved {len(todos)} todos from list {list_id}")    
-        return todos
+        todos = await service.get_todos_in_list_json(
+            list_id=list_id,
+            current_user=current_user,
+            order_by=order_by,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            version=version,
+        )
+        logger.info(f"Retrieved todos from list {list_id} ({len(todos)} bytes)")
+        # 已编码的 JSON 直接返回，跳过 response_model 的再次校验与序列化
+        return Response(content=todos, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to fetch todos from list {list_id}: {str(e)}")
         raise
@@ -1,18 +1,34 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.core.logging import get_logger
 from app.core.security import get_current_user
+from app.repository.read_models import TODO_FIELDS, parse_fields
 from app.repository.todo_repo import TodosRepository
 from app.service.todo_service import TodosService
-from app.schemas.schemas import TodoUpdate, TodoResponse, UserResponse
+from app.schemas.schemas import (
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoMultiGet,
+    TodoMultiGetResult,
+    TodoPage,
+    TodoUpdate,
+    TodoResponse,
+    UserResponse,
+)
+from app.utils.etag import conditional_get, data_version
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 
 # Set up logger for this module
 logger = get_logger(__name__)
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 router = APIRouter(tags=["Todos"], dependencies=[Depends(get_current_user)])
 
@@ -23,40 +39,90 @@ def get_todos_service(session: AsyncSession = Depends(get_db)) -> TodosService:
     return TodosService(repository)
 
 
+async def stream_todos_ndjson(**filters):
+    """Stream todos as NDJSON on a session owned by the response body."""
+    # 响应体在依赖清理之后才发送，因此使用独立的会话
+    async with SessionLocal() as session:
+        service = TodosService(TodosRepository(session))
+        async for chunk in service.stream_todos(**filters):
+            yield chunk
+
+
 @router.get("/todos/{todo_id}", response_model=TodoResponse)
 async def get_todo_by_id(
     todo_id: int,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated todo fields to return (e.g., id,content,completed)")
+    ] = None,
+    etag: str = Depends(conditional_get),
     service: TodosService = Depends(get_todos_service),
     current_user: UserResponse = Depends(get_current_user),
-) -> TodoResponse:
-    """Get todo by id."""
+) -> Response:
+    """Get todo by id, optionally only some of its fields."""
     try:
-        todo = await service.get_todo(todo_id=todo_id, current_user=current_user)
+        todo = await service.get_todo(todo_id=todo_id, current_user=current_user, fields=fields)
         logger.info(f"Retrieved todo item {todo_id}")
-        return todo
+        # 已编码的 JSON 直接返回，跳过 response_model 的再次校验与序列化
+        return Response(content=todo, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to fetch todo item {todo_id}: {str(e)}")
         raise
 
 
-@router.get("/todos", response_model=list[TodoResponse])
+@router.get("/todos", response_model=list[TodoResponse] | TodoPage)
 async def get_all_todos(
+    request: Request,
     list_id: Annotated[int | None, Query(description="Filter by list ID")] = None,
     status: Annotated[
         str | None, Query(description="Filter by status (unfinished/finished)")
     ] = None,
     search: Annotated[
-        str | None, Query(description="Search todos by title or description")
+        str | None, Query(description="Full-text search on content, each word matched as a substring")
     ] = None,
     order_by: Annotated[
         str | None, Query(description="Order by field (e.g., created_at desc/asc, priority desc/asc)")
     ] = None,
+    limit: Annotated[
+        int | None, Query(ge=1, le=MAX_PAGE_SIZE, description="Page size, returns a paginated response")
+    ] = None,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated todo fields to return (e.g., id,content,completed)")
+    ] = None,
+    etag: str = Depends(conditional_get),
+    version: int = Depends(data_version),
     service: TodosService = Depends(get_todos_service),
     current_user: UserResponse = Depends(get_current_user),
-) -> list[TodoResponse]:
+) -> Response:
     """
     Get all todos with optional filtering and sorting.
+
+    Pass `limit` (and then `cursor`) to page through results, or send
+    `Accept: application/x-ndjson` to stream every match as NDJSON. Pass
+    `fields` to select only some columns of each todo.
+    Responses carry an ETag; send it back in `If-None-Match` to get a
+    `304 Not Modified` while nothing has changed.
     """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        # 响应头发出后就无法再返回 400，先校验 fields
+        parse_fields(fields, TODO_FIELDS)
+        logger.info("Streaming todo items as NDJSON")
+        return StreamingResponse(
+            stream_todos_ndjson(
+                current_user=current_user,
+                list_id=list_id,
+                status=status,
+                search=search,
+                order_by=order_by,
+                fields=fields,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers={"ETag": etag},
+        )
+    if cursor and limit is None:
+        limit = DEFAULT_PAGE_SIZE
     try:
         result = await service.get_todos(
             current_user=current_user,
@@ -64,14 +130,45 @@ async def get_all_todos(
             status=status,
             search=search,
             order_by=order_by,
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+            version=version,
         )
-        logger.info(f"Retrieved {len(result)} todo items")
-        return result
+        logger.info(f"Retrieved todo items ({len(result)} bytes)")
+        # 已编码的 JSON 直接返回，跳过 response_model 的再次校验与序列化
+        return Response(content=result, media_type="application/json", headers={"ETag": etag})
     except Exception as e:
         logger.error(f"Failed to fetch todo items: {str(e)}")
         raise
 
 
+@router.post("/todos:get", response_model=TodoMultiGetResult)
+async def get_todos_by_ids(
+    data: TodoMultiGet,
+    fields: Annotated[
+        str | None, Query(description="Comma-separated todo fields to return (e.g., id,content,completed)")
+    ] = None,
+    service: TodosService = Depends(get_todos_service),
+    current_user: UserResponse = Depends(get_current_user),
+) -> Response:
+    """Get many todos by id in one request.
+
+    IDs that do not exist, or belong to another user, are reported in
+    `missing` instead of failing the request.
+    """
+    try:
+        result = await service.get_todos_by_ids(
+            data=data, current_user=current_user, fields=fields
+        )
+        logger.info(f"Retrieved todo items by id ({len(data.ids)} requested)")
+        # 已编码的 JSON 直接返回，跳过 response_model 的再次校验与序列化
+        return Response(content=result, media_type="application/json")
+    except Exception as e:
+        logger.error(f"Failed to fetch todo items by id: {str(e)}")
+        raise
+
+
 @router.patch(
     "/todos/{todo_id}", response_model=TodoResponse, status_code=status.HTTP_200_OK
 )
@@ -106,3 +203,35 @@ async def delete_todo(
     except Exception as e:
         logger.error(f"Failed to delete todo item {todo_id}: {str(e)}")
         raise
+
+
+@router.post("/todos:bulk-update", response_model=TodoBulkResult)
+async def bulk_update_todos(
+    data: TodoBulkUpdate,
+    service: TodosService = Depends(get_todos_service),
+    current_user: UserResponse = Depends(get_current_user),
+) -> TodoBulkResult:
+    """Update todos selected by `ids` or `filter` in one statement."""
+    try:
+        result = await service.bulk_update_todos(data=data, current_user=current_user)
+        logger.info(f"Bulk updated {result.count} todo items")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to bulk update todo items: {str(e)}")
+        raise
+
+
+@router.post("/todos:bulk-delete", response_model=TodoBulkResult)
+async def bulk_delete_todos(
+    data: TodoBulkDelete,
+    service: TodosService = Depends(get_todos_service),
+    current_user: UserResponse = Depends(get_current_user),
+) -> TodoBulkResult:
+    """Delete todos selected by `ids` or `filter` in one statement."""
+    try:
+        result = await service.bulk_delete_todos(data=data, current_user=current_user)
+        logger.info(f"Bulk deleted {result.count} todo items")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to bulk delete todo items: {str(e)}")
+        raise
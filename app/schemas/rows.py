@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import Sequence
+from typing_extensions import TypedDict
+
+from pydantic import TypeAdapter
+
+from app.utils.pagination import build_page
+
+
+# 快速序列化路径：数据库行 (Row) -> dict -> JSON bytes，一次完成。
+# TypedDict 没有 Python 层的校验器，TypeAdapter 在导入时编译好序列化器，
+# 输出与 TodoResponse / TodoPage 的 JSON 完全一致（字段顺序相同）。
+# total=False：指定 fields 时只包含所选字段。
+
+
+class TodoRow(TypedDict, total=False):
+    content: str
+    priority: str
+    id: int
+    list_id: int
+    created_at: datetime
+    completed: bool
+    user_id: int
+
+
+class TodoPageRow(TypedDict):
+    items: list[TodoRow]
+    limit: int
+    next_cursor: str | None
+
+
+class TodoMultiGetRow(TypedDict):
+    items: list[TodoRow]
+    missing: list[int]
+
+
+class ListRow(TypedDict, total=False):
+    title: str
+    description: str | None
+    id: int
+    user_id: int
+    todo_count: int
+    completed_count: int
+    low_count: int
+    medium_count: int
+    high_count: int
+    todos: None
+
+
+todo_row_adapter = TypeAdapter(TodoRow)
+todo_rows_adapter = TypeAdapter(list[TodoRow])
+todo_page_adapter = TypeAdapter(TodoPageRow)
+todo_multi_get_adapter = TypeAdapter(TodoMultiGetRow)
+list_rows_adapter = TypeAdapter(list[ListRow])
+
+
+def row_dicts(rows: Sequence, fields: Sequence[str] | None = None) -> list[dict]:
+    """Plain dicts of read-model rows (see app.repository.read_models).
+
+    With ``fields``, columns selected only for pagination are left out.
+    """
+    if not rows:
+        return []
+    # 列名只取一次；逐行调用 Row._asdict() 的开销比编码本身还大
+    keys = rows[0]._fields
+    if fields is None or len(keys) == len(fields):
+        return [dict(zip(keys, row)) for row in rows]
+    positions = [keys.index(name) for name in fields]
+    return [{name: row[i] for name, i in zip(fields, positions)} for row in rows]
+
+
+def encode_todos(
+    todos,
+    order_by: str | None,
+    limit: int | None,
+    fields: Sequence[str] | None = None,
+) -> bytes:
+    """Encode fetched todos as the JSON of list[TodoResponse], or of a TodoPage with a limit."""
+    if limit is None:
+        return todo_rows_adapter.dump_json(row_dicts(todos, fields))
+    items, next_cursor = build_page(todos, order_by, limit)
+    return todo_page_adapter.dump_json(
+        {
+            "items": row_dicts(items, fields),
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def encode_todo(todo, fields: Sequence[str] | None = None) -> bytes:
+    """Encode one fetched todo as the JSON of a TodoResponse."""
+    return todo_row_adapter.dump_json(row_dicts([todo], fields)[0])
+
+
+def encode_todos_ndjson(todos, fields: Sequence[str] | None = None) -> bytes:
+    """Encode todos as NDJSON, one TodoResponse object per line."""
+    return b"".join(
+        todo_row_adapter.dump_json(todo) + b"\n" for todo in row_dicts(todos, fields)
+    )
+
+
+def encode_todo_multi_get(
+    todos, ids: Sequence[int], fields: Sequence[str] | None = None
+) -> bytes:
+    """Encode fetched todos as the JSON of a TodoMultiGetResult.
+
+    Items follow the order of ``ids`` (duplicates collapsed); requested IDs
+    without a row are reported in ``missing``.
+    """
+    by_id = {todo.id: todo for todo in todos}
+    found, missing = [], []
+    for todo_id in dict.fromkeys(ids):
+        todo = by_id.get(todo_id)
+        if todo is None:
+            missing.append(todo_id)
+        else:
+            found.append(todo)
+    items = row_dicts(found, fields)
+    return todo_multi_get_adapter.dump_json({"items": items, "missing": missing})
+
+
+def encode_lists(lists, fields: Sequence[str] | None = None) -> bytes:
+    """Encode list summary rows as the JSON of list[ListResponse].
+
+    Without ``fields`` every object also carries ``"todos": null``, as
+    ListResponse does when the todos are not included.
+    """
+    rows = row_dicts(lists)
+    if fields is None:
+        for row in rows:
+            row["todos"] = None
+    return list_rows_adapter.dump_json(rows)
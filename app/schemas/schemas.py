@@ -1,12 +1,19 @@
-from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
 from datetime import datetime
+from typing import Literal
 
+from app.core.config import settings
 from app.models.models import Priority
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 
 class UserBase(BaseModel):
@@ -59,6 +66,10 @@ class TodoCreate(TodoBase):
             )
 
 
+class TodoBatchCreate(BaseModel):
+    items: list[TodoCreate] = Field(min_length=1, max_length=settings.TODO_BATCH_MAX_SIZE)
+
+
 class TodoUpdate(BaseModel):  # 继承 BaseModel 避免继承 title
     content: str | None = None
     priority: str | None = None
@@ -75,6 +86,61 @@ class TodoUpdate(BaseModel):  # 继承 BaseModel 避免继承 title
             )
 
 
+class TodoBulkChanges(TodoUpdate):
+    list_id: int | None = None  # 移动到另一个列表
+
+
+class TodoFilter(BaseModel):
+    """Same filters as GET /todos.
+
+    A filter without any criterion would select every todo of the user, so
+    it is rejected unless ``all`` is set explicitly.
+    """
+
+    list_id: int | None = None
+    status: Literal["finished", "unfinished"] | None = None
+    search: str | None = None
+    all: bool = False
+
+    @model_validator(mode="after")
+    def check_criteria(self):
+        # 空过滤条件等于选中全部待办，必须显式 all: true
+        if not (self.list_id or self.status or (self.search and self.search.strip()) or self.all):
+            raise ValueError("Filter sets no criteria; pass all: true to select every todo")
+        return self
+
+
+class TodoBulkDelete(BaseModel):
+    ids: list[int] | None = Field(default=None, max_length=settings.TODO_BATCH_MAX_SIZE)
+    filter: TodoFilter | None = None
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        # ids 与 filter 二选一，避免误操作全部待办
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of ids or filter")
+        return self
+
+
+class TodoBulkUpdate(TodoBulkDelete):
+    changes: TodoBulkChanges
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        if not self.changes.model_dump(exclude_unset=True, exclude_none=True):
+            raise ValueError("No fields to update")
+        return self
+
+
+class TodoBulkResult(BaseModel):
+    ids: list[int]
+    count: int
+
+
+class TodoMultiGet(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=settings.TODO_BATCH_MAX_SIZE)
+
+
 class TodoResponse(TodoBase):
     id: int
     list_id: int
@@ -92,6 +158,17 @@ class TodoResponse(TodoBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoPage(BaseModel):
+    items: list[TodoResponse]
+    limit: int
+    next_cursor: str | None = None
+
+
+class TodoMultiGetResult(BaseModel):
+    items: list[TodoResponse]
+    missing: list[int]  # 不存在或不属于当前用户的 ID
+
+
 class ListBase(BaseModel):
     title: str
     description: str | None = None
@@ -109,6 +186,20 @@ class ListUpdate(BaseModel):  # 继承 BaseModel 避免继承 title
 class ListResponse(ListBase):
     id: int
     user_id: int
-    todos: list[TodoResponse] | None = None
+    # 汇总视图：计数来自 list_stats，不加载待办本身
+    todo_count: int = 0
+    completed_count: int = 0
+    low_count: int = 0
+    medium_count: int = 0
+    high_count: int = 0
+    # 仅在 include=todos 时返回一页待办
+    todos: TodoPage | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class DashboardResponse(BaseModel):
+    user: UserResponse
+    lists: list[ListResponse]  # 汇总视图，不含待办
+    top_todos: list[TodoResponse]  # 未完成，按优先级从高到低
+    recent_todos: list[TodoResponse]  # 按创建时间从新到旧
@@ -0,0 +1,40 @@
+from app.core.cache import MemoryCacheBackend, ResponseCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+
+# 列表/待办查询结果缓存，按用户划分作用域
+response_cache = ResponseCache(
+    MemoryCacheBackend(
+        maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL
+    ),
+    enabled=settings.RESPONSE_CACHE_ENABLED,
+)
+
+# 会使结果缓存失效的实体键
+DATA_KEYS = ("lists", "todos")
+
+
+def user_scope(user_id: int) -> str:
+    """Cache scope holding every cached list/todo result of a user."""
+    return f"user:{user_id}"
+
+
+async def invalidate_user_data(user_id: int, *keys: str) -> None:
+    """Drop a user's cached results after a committed write, in every worker.
+
+    Args:
+        user_id (int): The user whose lists or todos changed.
+        *keys (str): The changed entities, "lists" and/or "todos".
+    """
+    await response_cache.invalidate(user_scope(user_id))
+    await invalidation_bus.publish(user_id, list(keys or DATA_KEYS))
+
+
+async def _apply_invalidation(user_id: int, keys: list[str]) -> None:
+    """Apply a peer worker's list/todo writes to this worker's result cache."""
+    if any(key in DATA_KEYS for key in keys):
+        await response_cache.invalidate(user_scope(user_id))
+
+
+invalidation_bus.register(_apply_invalidation, flush=response_cache.clear)
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import SessionLocal
+from app.repository.list_repo import TodoListRepository
+from app.repository.todo_repo import TodosRepository
+from app.service.cache import response_cache, user_scope
+from app.schemas.schemas import DashboardResponse, ListResponse, TodoResponse
+
+T = TypeVar("T")
+
+
+class DashboardService:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] = SessionLocal):
+        """Service layer for the dashboard.
+
+        Every sub-query gets its own session, and thus its own pooled read
+        connection, so they run concurrently instead of one after another
+        on a shared session.
+        """
+
+        self.session_factory = session_factory
+
+    async def _read(self, load: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with self.session_factory() as session:
+            return await load(session)
+
+    async def get_dashboard(
+        self, current_user, top: int, recent: int, version: int | None = None
+    ) -> DashboardResponse:
+        """Get everything a client shows on startup in one call.
+
+        Args:
+            current_user (User): current user.
+            top (int): Number of unfinished todos to return, highest priority first.
+            recent (int): Number of most recently created todos to return.
+            version (int | None): The user's data version; results are cached per version.
+
+        Returns:
+            DashboardResponse: The user, the summaries of all their lists and
+            the two todo selections.
+        """
+
+        async def _load() -> DashboardResponse:
+            lists, top_todos, recent_todos = await asyncio.gather(
+                self._read(lambda session: TodoListRepository(session).get_all(current_user)),
+                self._read(
+                    lambda session: TodosRepository(session).get_top_unfinished(
+                        current_user.id, top
+                    )
+                ),
+                self._read(
+                    lambda session: TodosRepository(session).get_all(
+                        user_id=current_user.id, order_by="created_at desc", limit=recent
+                    )
+                ),
+            )
+            return DashboardResponse(
+                user=current_user,
+                lists=[ListResponse.model_validate(list) for list in lists],
+                top_todos=[TodoResponse.model_validate(todo) for todo in top_todos],
+                # get_all 为判断下一页会多取一行
+                recent_todos=[
+                    TodoResponse.model_validate(todo) for todo in recent_todos[:recent]
+                ],
+            )
+
+        key = f"dashboard:{(top, recent)!r}"
+        return await response_cache.get_or_load(
+            user_scope(current_user.id), key, _load, version
+        )
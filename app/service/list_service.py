@@ -1,12 +1,31 @@
+import asyncio
+from typing import TextIO
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 flock
+    fcntl = None
+
+from app.core.database import SessionLocal, database_path
+from app.core.invalidation import invalidation_bus
+from app.core.logging import get_logger
 from app.repository.list_repo import TodoListRepository
+from app.repository.read_models import LIST_FIELDS, TODO_FIELDS, parse_fields
+from app.service.cache import invalidate_user_data, response_cache, user_scope
+from app.schemas.rows import encode_lists, encode_todos
 from app.utils.rabbitmq import RabbitMQClient
 from app.schemas.schemas import (
     ListResponse,
     ListCreate,
     ListUpdate,
+    TodoBatchCreate,
     TodoCreate,
+    TodoPage,
     TodoResponse,
 )
+from app.utils.pagination import DEFAULT_PAGE_SIZE, build_page
+
+logger = get_logger(__name__)
 
 
 class TodoListService:
@@ -28,32 +47,77 @@ class TodoListService:
         """
 
         new_list = await self.repository.create(data, current_user)
+        await invalidate_user_data(current_user.id, "lists")
         return ListResponse.model_validate(new_list)
 
-    async def get_list(self, list_id: int, current_user) -> ListResponse:
-        """Get a TodoList by ID for the current user.
+    async def get_list(
+        self,
+        list_id: int,
+        current_user,
+        include_todos: bool = False,
+        order_by: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        version: int | None = None,
+    ) -> ListResponse:
+        """Get a TodoList summary by ID for the current user.
 
         Args:
             list_id: The ID of the TodoList.
             current_user (User): current user.
+            include_todos (bool): Also return one page of the list's TodoItems.
+            order_by (str | None): Sort order of the TodoItems.
+            limit (int | None): Page size of the TodoItems, defaults to DEFAULT_PAGE_SIZE.
+            cursor (str | None): Cursor of the TodoItem page to fetch.
+            version (int | None): The user's data version; results are cached per version.
 
         Returns:
-            ListResponse: The TodoList if found, otherwise None.
+            ListResponse: The TodoList with its todo counts.
         """
-        list = await self.repository.get_by_id(list_id, current_user)
-        return ListResponse.model_validate(list)
 
-    async def get_lists(self, current_user) -> list[ListResponse]:
-        """Get all lists for the current user.
+        async def _load() -> ListResponse:
+            list = ListResponse.model_validate(
+                await self.repository.get_by_id(list_id, current_user)
+            )
+            if include_todos:
+                list.todos = await self.get_todos_in_list(
+                    list_id,
+                    current_user,
+                    order_by=order_by,
+                    limit=limit or DEFAULT_PAGE_SIZE,
+                    cursor=cursor,
+                )
+            return list
+
+        key = f"list:{(list_id, include_todos, order_by, limit, cursor)!r}"
+        return await response_cache.get_or_load(
+            user_scope(current_user.id), key, _load, version
+        )
+
+    async def get_lists(
+        self, current_user, fields: str | None = None, version: int | None = None
+    ) -> bytes:
+        """Get all lists for the current user, encoded as JSON.
 
         Args:
             current_user (User): current user.
+            fields (str | None): Comma-separated ListResponse fields to return, all by default.
+            version (int | None): The user's data version; results are cached per version.
 
         Returns:
-            list[ListResponse]: List of all todo lists.
+            bytes: JSON of list[ListResponse], summaries of all todo lists
+            without their TodoItems.
         """
-        lists = await self.repository.get_all(current_user)
-        return [ListResponse.model_validate(list) for list in lists]
+        selected = parse_fields(fields, LIST_FIELDS)
+
+        async def _load() -> bytes:
+            lists = await self.repository.get_all(current_user, fields=selected)
+            return encode_lists(lists, selected)
+
+        key = "lists" if selected is None else f"lists:{selected!r}"
+        return await response_cache.get_or_load(
+            user_scope(current_user.id), key, _load, version
+        )
 
     async def update_list(
         self, list_id: int, data: ListUpdate, current_user
@@ -69,6 +133,7 @@ class TodoListService:
             ListResponse: The updated TodoList item.
         """
         list = await self.repository.update(list_id, data, current_user)
+        await invalidate_user_data(current_user.id, "lists")
         return ListResponse.model_validate(list)
 
     async def delete_list(self, list_id: int, current_user) -> None:
@@ -81,6 +146,7 @@ class TodoListService:
         """
 
         await self.repository.delete(list_id, current_user)
+        await invalidate_user_data(current_user.id, "lists", "todos")
 
     async def create_todo(
         self, list_id: int, data: TodoCreate, current_user
@@ -96,6 +162,7 @@ class TodoListService:
             TodoResponse: newly created TodoItem item.
         """
         todo = await self.repository.create_todo(list_id, data, current_user)
+        await invalidate_user_data(current_user.id, "todos", "lists")
         if todo:
             message = {
                 "todo_id": todo.id,
@@ -109,15 +176,154 @@ class TodoListService:
             await self.rabbitmq.send_message(message=message, queue="todo_notifications")
         return TodoResponse.model_validate(todo)
 
-    async def get_todos_in_list(self, list_id: int, current_user) -> list[TodoResponse]:
+    async def create_todos(
+        self, list_id: int, data: TodoBatchCreate, current_user
+    ) -> list[TodoResponse]:
+        """Create several TodoItems in a specific list for the current user.
+
+        Args:
+            list_id (int): The ID of the TodoList to create the TodoItems in.
+            data (TodoBatchCreate): the TodoItems to create.
+            current_user (User): current user.
+
+        Returns:
+            list[TodoResponse]: the created TodoItems.
+        """
+        todos = await self.repository.create_todos(list_id, data.items, current_user)
+        await invalidate_user_data(current_user.id, "todos", "lists")
+        message = {
+            "list_id": list_id,
+            "user_id": str(current_user.id),
+            "action": "created_batch",
+            "todos": [
+                {
+                    "todo_id": todo.id,
+                    "content": todo.content,
+                    "priority": str(todo.priority),
+                    "completed": todo.completed,
+                }
+                for todo in todos
+            ],
+        }
+        await self.rabbitmq.send_message(message=message, queue="todo_notifications")
+        return [TodoResponse.model_validate(todo) for todo in todos]
+
+    async def get_todos_in_list(
+        self,
+        list_id: int,
+        current_user,
+        order_by: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> list[TodoResponse] | TodoPage:
         """Get all TodoItems in a given list for the current user.
 
         Args:
             list_id: The ID of the list to retrieve TodoItems from.
             current_user (User): The current user requesting the TodoItems.
+            order_by (str | None): Sort order, e.g. "created_at desc".
+            limit (int | None): Page size, enables cursor pagination.
+            cursor (str | None): Cursor of the page to fetch.
 
         Returns:
-            list[TodoResponse]: List of all TodoItems in the list.
+            list[TodoResponse] | TodoPage: All TodoItems in the list, or one
+            page of them when a limit is given.
         """
-        todos = await self.repository.get_todos_by_list_id(list_id, current_user)
-        return [TodoResponse.model_validate(todo) for todo in todos]
+        todos = await self.repository.get_todos_by_list_id(
+            list_id, current_user, order_by=order_by, limit=limit, cursor=cursor
+        )
+        if limit is None:
+            return [TodoResponse.model_validate(todo) for todo in todos]
+        items, next_cursor = build_page(todos, order_by, limit)
+        return TodoPage(
+            items=[TodoResponse.model_validate(todo) for todo in items],
+            limit=limit,
+            next_cursor=next_cursor,
+        )
+
+    async def get_todos_in_list_json(
+        self,
+        list_id: int,
+        current_user,
+        order_by: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+        version: int | None = None,
+    ) -> bytes:
+        """Get the TodoItems of a list encoded as JSON, like get_todos_in_list.
+
+        Rows are encoded in one pass without building Pydantic models.
+        ``fields`` restricts the selected columns and the keys of each todo.
+        Results are cached per data ``version`` of the user.
+
+        Returns:
+            bytes: JSON of list[TodoResponse], or of a TodoPage when a limit is given.
+        """
+        selected = parse_fields(fields, TODO_FIELDS)
+
+        async def _load() -> bytes:
+            todos = await self.repository.get_todos_by_list_id(
+                list_id,
+                current_user,
+                order_by=order_by,
+                limit=limit,
+                cursor=cursor,
+                fields=selected,
+            )
+            return encode_todos(todos, order_by, limit, selected)
+
+        key = f"list_todos:{(list_id, order_by, limit, cursor, selected)!r}"
+        return await response_cache.get_or_load(
+            user_scope(current_user.id), key, _load, version
+        )
+
+
+# 持有对账锁的文件；进程退出时由操作系统释放
+_reconciler_lock: TextIO | None = None
+
+
+def _acquire_reconciler_lock() -> bool:
+    """Try to become the one worker that runs the list_stats reconciler.
+
+    Takes a non-blocking exclusive flock on a file next to the database and
+    keeps it for the life of the process. When that worker exits, another
+    one takes the lock over at its next attempt.
+    """
+    global _reconciler_lock
+    if _reconciler_lock is not None:
+        return True
+    if fcntl is None:
+        # 没有 flock 的平台只用于单进程开发，直接运行
+        return True
+    lock = open(f"{database_path}.reconcile.lock", "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock.close()
+        return False
+    _reconciler_lock = lock
+    return True
+
+
+async def run_list_stats_reconciler(interval: float) -> None:
+    """Periodically repair list_stats counters that drifted from the todos.
+
+    Only the worker holding the reconciler lock does the work; the others
+    just retry the lock every interval.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if not _acquire_reconciler_lock():
+            continue
+        try:
+            async with SessionLocal() as session:
+                repaired = await TodoListRepository(session).reconcile_stats()
+            if repaired:
+                logger.warning(f"Repaired drifted list_stats for lists {repaired}")
+                # 修复很少发生，直接清空所有 worker 的结果缓存
+                await invalidation_bus.broadcast_flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"List stats reconciliation failed: {e}")
@@ -1,5 +1,17 @@
+from typing import AsyncIterator
+
+from app.repository.read_models import TODO_FIELDS, parse_fields
 from app.repository.todo_repo import TodosRepository
-from app.schemas.schemas import TodoResponse, TodoUpdate
+from app.service.cache import invalidate_user_data, response_cache, user_scope
+from app.schemas.rows import encode_todo, encode_todo_multi_get, encode_todos, encode_todos_ndjson
+from app.schemas.schemas import (
+    TodoBulkDelete,
+    TodoBulkResult,
+    TodoBulkUpdate,
+    TodoMultiGet,
+    TodoResponse,
+    TodoUpdate,
+)
 from app.utils.rabbitmq import RabbitMQClient
 
 
@@ -10,18 +22,38 @@ class TodosService:
         self.repository = repository
         self.rabbitmq = RabbitMQClient()
 
-    async def get_todo(self, todo_id: int, current_user) -> TodoResponse:
-        """Get a TodoItem by ID for the current user.
+    async def get_todo(self, todo_id: int, current_user, fields: str | None = None) -> bytes:
+        """Get a TodoItem by ID for the current user, encoded as JSON.
 
         Args:
             todo_id: The ID of the TodoItem.
             current_user (User): The current user requesting the TodoItem.
+            fields (str | None): Comma-separated todo fields to return, all by default.
 
         Returns:
-            TodoResponse: The TodoItem if found.
+            bytes: JSON of the TodoResponse, with only ``fields`` when given.
         """
-        todo = await self.repository.get_by_id(todo_id, current_user)
-        return TodoResponse.model_validate(todo)
+        selected = parse_fields(fields, TODO_FIELDS)
+        todo = await self.repository.get_by_id(todo_id, current_user, fields=selected)
+        return encode_todo(todo, selected)
+
+    async def get_todos_by_ids(
+        self, data: TodoMultiGet, current_user, fields: str | None = None
+    ) -> bytes:
+        """Get many TodoItems by ID in one query, encoded as JSON.
+
+        Args:
+            data (TodoMultiGet): The IDs of the TodoItems to retrieve.
+            current_user (User): The current user requesting the TodoItems.
+            fields (str | None): Comma-separated todo fields to return, all by default.
+
+        Returns:
+            bytes: JSON of a TodoMultiGetResult; IDs that are not found are
+            listed in ``missing`` instead of failing the request.
+        """
+        selected = parse_fields(fields, TODO_FIELDS)
+        todos = await self.repository.get_many(data.ids, current_user, fields=selected)
+        return encode_todo_multi_get(todos, data.ids, selected)
 
     async def get_todos(
         self,
@@ -30,18 +62,60 @@ class TodosService:
         status: str | None = None,
         search: str | None = None,
         order_by: str | None = None,
-    ) -> list[TodoResponse]:
-        """Call repository to get filtered todos."""
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
+        version: int | None = None,
+    ) -> bytes:
+        """Call repository to get filtered todos, encoded as JSON.
+
+        The body is a list[TodoResponse], or a TodoPage when a limit is
+        given. Rows are encoded in one pass without building Pydantic
+        models, and results are served from the response cache for the
+        user's data ``version``. ``fields`` (e.g. "id,content,completed")
+        restricts the selected columns and the keys of each todo.
+        """
+        selected = parse_fields(fields, TODO_FIELDS)
+
+        async def _load() -> bytes:
+            todos = await self.repository.get_all(
+                user_id=current_user.id,
+                list_id=list_id,
+                status=status,
+                search=search,
+                order_by=order_by,
+                limit=limit,
+                cursor=cursor,
+                fields=selected,
+            )
+            return encode_todos(todos, order_by, limit, selected)
+
+        key = f"todos:{(list_id, status, search, order_by, limit, cursor, selected)!r}"
+        return await response_cache.get_or_load(
+            user_scope(current_user.id), key, _load, version
+        )
+
+    async def stream_todos(
+        self,
+        current_user,
+        list_id: int | None = None,
+        status: str | None = None,
+        search: str | None = None,
+        order_by: str | None = None,
+        fields: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield filtered todos as NDJSON, one encoded chunk per database fetch."""
+        selected = parse_fields(fields, TODO_FIELDS)
 
-        todos = await self.repository.get_all(
+        async for todos in self.repository.stream_all(
             user_id=current_user.id,
             list_id=list_id,
             status=status,
             search=search,
             order_by=order_by,
-        )
-
-        return [TodoResponse.model_validate(todo) for todo in todos]
+            fields=selected,
+        ):
+            yield encode_todos_ndjson(todos, selected)
 
     async def update_todo(
         self, todo_id: int, data: TodoUpdate, current_user
@@ -57,6 +131,7 @@ class TodosService:
             TodoResponse: The updated TodoItem.
         """
         updated_todo = await self.repository.update(todo_id, data, current_user)
+        await invalidate_user_data(current_user.id, "todos", "lists")
         if updated_todo:
             message = {
                 "todo_id": updated_todo.id,
@@ -78,5 +153,60 @@ class TodosService:
             current_user (User): The current user performing the deletion.
         """
         await self.repository.delete(todo_id, current_user)
+        await invalidate_user_data(current_user.id, "todos", "lists")
         message = {"todo_id": todo_id, "action": "deleted"}
         await self.rabbitmq.send_message(message=message, queue="todo_notifications")
+
+    async def bulk_update_todos(
+        self, data: TodoBulkUpdate, current_user
+    ) -> TodoBulkResult:
+        """Update many TodoItems selected by id set or filter.
+
+        Args:
+            data (TodoBulkUpdate): The selection and the fields to set.
+            current_user (User): The current user performing the update.
+
+        Returns:
+            TodoBulkResult: The IDs of the updated TodoItems.
+        """
+        ids = await self.repository.bulk_update(
+            current_user, data.changes, ids=data.ids, filter=data.filter
+        )
+        if ids:
+            await invalidate_user_data(current_user.id, "todos", "lists")
+            changes = data.changes.model_dump(exclude_unset=True, exclude_none=True)
+            if "priority" in changes:
+                changes["priority"] = str(changes["priority"])
+            message = {
+                "todo_ids": ids,
+                "changes": changes,
+                "user_id": str(current_user.id),
+                "action": "bulk_updated",
+            }
+            await self.rabbitmq.send_message(message=message, queue="todo_notifications")
+        return TodoBulkResult(ids=ids, count=len(ids))
+
+    async def bulk_delete_todos(
+        self, data: TodoBulkDelete, current_user
+    ) -> TodoBulkResult:
+        """Delete many TodoItems selected by id set or filter.
+
+        Args:
+            data (TodoBulkDelete): The selection of TodoItems to delete.
+            current_user (User): The current user performing the deletion.
+
+        Returns:
+            TodoBulkResult: The IDs of the deleted TodoItems.
+        """
+        ids = await self.repository.bulk_delete(
+            current_user, ids=data.ids, filter=data.filter
+        )
+        if ids:
+            await invalidate_user_data(current_user.id, "todos", "lists")
+            message = {
+                "todo_ids": ids,
+                "user_id": str(current_user.id),
+                "action": "bulk_deleted",
+            }
+            await self.rabbitmq.send_message(message=message, queue="todo_notifications")
+        return TodoBulkResult(ids=ids, count=len(ids))
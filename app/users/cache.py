@@ -0,0 +1,108 @@
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.invalidation import invalidation_bus
+from app.models.models import User
+
+
+# 已认证用户缓存: username -> UserResponse
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+# 用户版本: user_id -> version。本进程与其他 worker 的变更会直接更新条目，
+# 未命中或过期时回源数据库，重启后或广播丢失时最多在 TTL 内接受旧令牌
+user_versions = TTLCache(
+    maxsize=settings.USER_VERSION_CACHE_SIZE, ttl=settings.USER_VERSION_CACHE_TTL
+)
+DELETED = 0  # 已删除用户的版本；真实版本从 1 开始
+
+
+def invalidate_user(username: str) -> None:
+    """Drop a cached user so the next request reloads it from the database."""
+    user_cache.delete(username)
+
+
+async def _load_user_version(user_id: int) -> int:
+    async with SessionLocal() as session:
+        version = await session.scalar(select(User.version).where(User.id == user_id))
+    return DELETED if version is None else version
+
+
+async def is_token_version_current(user_id: int, version: int) -> bool:
+    """Check a stateless token's version claim against the account's version.
+
+    Versions are cached, so the database is read at most once per user and
+    USER_VERSION_CACHE_TTL; unknown users are looked up, never trusted.
+    """
+    current = user_versions.get(user_id)
+    if current is None:
+        current = await _load_user_version(user_id)
+        # 查询期间可能已收到更新的版本，版本只增不减
+        newer = user_versions.get(user_id)
+        if newer is not None and (newer == DELETED or newer > current):
+            current = newer
+        user_versions.set(user_id, current)
+    return current != DELETED and version >= current
+
+
+def _queue_broadcast(target: User, keys: list[str]) -> None:
+    # 提交后才广播，避免其他 worker 在提交前重新加载到旧数据
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("invalidated_users", {})[target.id] = keys
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target: User) -> None:
+    invalidate_user(target.username)
+    # 用户名被修改时旧的键也要失效
+    old_usernames = list(inspect(target).attrs.username.history.deleted or ())
+    for old_username in old_usernames:
+        invalidate_user(old_username)
+    user_versions.set(target.id, target.version)
+    _queue_broadcast(
+        target,
+        [f"user:{name}" for name in (target.username, *old_usernames)]
+        + [f"version:{target.version}"],
+    )
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User) -> None:
+    invalidate_user(target.username)
+    user_versions.set(target.id, DELETED)
+    _queue_broadcast(target, [f"user:{target.username}", "deleted"])
+
+
+@event.listens_for(Session, "after_commit")
+def _broadcast_user_invalidations(session: Session) -> None:
+    pending = session.info.pop("invalidated_users", None)
+    if pending:
+        for user_id, keys in pending.items():
+            invalidation_bus.publish_soon(user_id, keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_invalidations(session: Session) -> None:
+    session.info.pop("invalidated_users", None)
+
+
+async def _apply_invalidation(user_id: int, keys: list[str]) -> None:
+    """Apply a peer worker's user changes to this worker's caches."""
+    for key in keys:
+        if key.startswith("user:"):
+            invalidate_user(key.removeprefix("user:"))
+        elif key.startswith("version:"):
+            user_versions.set(user_id, int(key.removeprefix("version:")))
+        elif key == "deleted":
+            user_versions.set(user_id, DELETED)
+
+
+async def _flush() -> None:
+    user_cache.clear()
+    user_versions.clear()
+
+
+invalidation_bus.register(_apply_invalidation, flush=_flush)
@@ -1,10 +1,13 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AlreadyExistsException, NotFoundException
 from app.core.logging import get_logger
 from app.core.security import get_password_hash
-from app.models.models import User
+from app.core.writer import run_write
+from app.models.models import RefreshToken, User
 from app.schemas.schemas import UserCreate, UserInDB, UserResponse
 
 
@@ -37,11 +40,16 @@ class UserRepository:
         username=user_data.username,
         email=user_data.email,
         full_name=user_data.full_name,
-        password_hash=get_password_hash(user_data.password),  # 加密密码
+        password_hash=await get_password_hash(user_data.password),  # 加密密码
     )
-        self.session.add(new_user)        
-        await self.session.commit()
-        await self.session.refresh(new_user)
+
+        async def _create(session: AsyncSession) -> User:
+            session.add(new_user)
+            await session.flush()
+            await session.refresh(new_user)
+            return new_user
+
+        await run_write(self.session, _create)
         logger.info(f"Created user: {new_user.username}")
         return new_user
         
@@ -84,4 +92,90 @@ class UserRepository:
         user = result.one_or_none()
         return user
 
-    
\ No newline at end of file
+
+class RefreshTokenRepository:
+    """Repository for the server-side refresh token store."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, jti: str, user_id: int, expires_at: datetime) -> None:
+        """
+        Store a newly issued refresh token and purge the user's expired ones.
+
+        Args:
+            jti (str): The token ID.
+            user_id (int): The owner of the token.
+            expires_at (datetime): When the token expires.
+        """
+        async def _create(session: AsyncSession) -> None:
+            await session.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.user_id == user_id,
+                    RefreshToken.expires_at <= datetime.now(timezone.utc),
+                )
+            )
+            session.add(RefreshToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            await session.flush()
+
+        await run_write(self.session, _create)
+
+    async def rotate(
+        self, old_jti: str, new_jti: str, expires_at: datetime
+    ) -> int | None:
+        """
+        Consume a refresh token and store its replacement in one transaction.
+
+        Args:
+            old_jti (str): The ID of the token being redeemed.
+            new_jti (str): The ID of the replacement token.
+            expires_at (datetime): When the replacement expires.
+
+        Returns:
+            int | None: The owner's user ID, or None if the old token is
+            unknown, already used or expired.
+        """
+        async def _rotate(session: AsyncSession) -> int | None:
+            # 单条主键 DELETE ... RETURNING 同时完成校验与作废
+            result = await session.execute(
+                delete(RefreshToken)
+                .where(
+                    RefreshToken.jti == old_jti,
+                    RefreshToken.expires_at > datetime.now(timezone.utc),
+                )
+                .returning(RefreshToken.user_id)
+            )
+            user_id = result.scalar_one_or_none()
+            if user_id is None:
+                return None
+            session.add(RefreshToken(jti=new_jti, user_id=user_id, expires_at=expires_at))
+            await session.flush()
+            return user_id
+
+        return await run_write(self.session, _rotate)
+
+    async def revoke(self, jti: str) -> None:
+        """
+        Revoke a single refresh token.
+
+        Args:
+            jti (str): The ID of the token to revoke.
+        """
+        async def _revoke(session: AsyncSession) -> None:
+            await session.execute(delete(RefreshToken).where(RefreshToken.jti == jti))
+
+        await run_write(self.session, _revoke)
+
+    async def revoke_all(self, user_id: int) -> None:
+        """
+        Revoke every refresh token belonging to a user.
+
+        Args:
+            user_id (int): The owner of the tokens.
+        """
+        async def _revoke_all(session: AsyncSession) -> None:
+            await session.execute(
+                delete(RefreshToken).where(RefreshToken.user_id == user_id)
+            )
+
+        await run_write(self.session, _revoke_all)
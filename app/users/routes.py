@@ -4,10 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.logging import get_logger
-from app.core.security import get_current_user
+from app.core.security import get_current_user, optional_oauth2_scheme
 from app.users.service import UserService
 from app.models.models import User
-from app.schemas.schemas import LoginData, Token,UserCreate, UserResponse
+from app.schemas.schemas import LoginData, RefreshRequest, Token,UserCreate, UserResponse
 
 
 logger = get_logger(__name__)
@@ -23,6 +23,24 @@ async def login(
     login_data = LoginData(username=form_data.username, password=form_data.password)
     logger.debug(f"Login attempt: {login_data.username}")
     return await UserService(session).authenticate(login_data)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh(
+    data: RefreshRequest, session: AsyncSession = Depends(get_db)
+) -> Token:
+    """Exchange a refresh token for a new access and refresh token."""
+    return await UserService(session).refresh(data.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    data: RefreshRequest,
+    access_token: str | None = Depends(optional_oauth2_scheme),
+    session: AsyncSession = Depends(get_db),
+) -> None:
+    """Revoke a refresh token and the bearer access token, if present."""
+    await UserService(session).logout(data.refresh_token, access_token)
     
 
 
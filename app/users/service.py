@@ -1,12 +1,19 @@
 from datetime import timedelta
+from types import SimpleNamespace
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.exceptions import UnauthorizedException
+from app.core.exceptions import NotFoundException, UnauthorizedException
 from app.core.logging import get_logger
-from app.core.security import create_access_token, verify_password
-from app.users.repository import UserRepository
+from app.core.security import (
+    create_refresh_token,
+    create_user_access_token,
+    decode_refresh_token,
+    revoke_access_token,
+    verify_password,
+)
+from app.users.repository import RefreshTokenRepository, UserRepository
 from app.schemas.schemas import LoginData,Token, UserCreate, UserInDB, UserResponse
 
 logger = get_logger(__name__)
@@ -18,6 +25,7 @@ class UserService:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.repository = UserRepository(session)
+        self.refresh_tokens = RefreshTokenRepository(session)
 
     async def create_user(self, user_data: UserCreate) -> UserInDB:
         """Create a new user."""
@@ -29,19 +37,70 @@ class UserService:
         user = await self.repository.get_by_username(login_data.username)
 
         # Verify credentials
-        if not user or not verify_password(
+        if not user or not await verify_password(
             login_data.password, str(user.password_hash)
         ):
             raise UnauthorizedException(detail="Incorrect username or password")
 
         # Create access token
-        access_token = create_access_token(
-            data={"sub": str(user.username)},
-            expires_delta=timedelta(minutes=settings.JWT_EXPIRATION),
+        access_token = create_user_access_token(
+            user, expires_delta=timedelta(minutes=settings.JWT_EXPIRATION)
         )
+        refresh_token, jti, expires_at = create_refresh_token(user)
+        await self.refresh_tokens.create(jti, user.id, expires_at)
 
         logger.info(f"User authenticated: {user.username}")
-        return Token(access_token=access_token)
+        return Token(access_token=access_token, refresh_token=refresh_token)
+
+    async def refresh(self, refresh_token: str) -> Token:
+        """Rotate a refresh token and issue a new access token.
+
+        With JWT_STATELESS the user is loaded, so the new access token carries
+        the current version. A refresh token issued before the version changed,
+        or whose user has been deleted, is rejected.
+
+        Raises:
+            UnauthorizedException: If the refresh token is invalid, reused or outdated.
+        """
+        payload = decode_refresh_token(refresh_token)
+
+        if settings.JWT_STATELESS:
+            # 新访问令牌携带 ver 声明，必须取自用户当前版本而不是刷新令牌
+            try:
+                user = await self.repository.get_by_id(payload["id"])
+            except NotFoundException:
+                raise UnauthorizedException(detail="Invalid refresh token")
+            if "ver" in payload and payload["ver"] != user.version:
+                # 签发后修改过密码或退出了全部会话
+                raise UnauthorizedException(detail="Invalid refresh token")
+        else:
+            user = SimpleNamespace(
+                id=payload["id"],
+                username=payload["sub"],
+                email=payload.get("email"),
+                full_name=payload.get("full_name"),
+                version=payload.get("ver"),
+            )
+
+        new_refresh_token, jti, expires_at = create_refresh_token(user)
+        user_id = await self.refresh_tokens.rotate(payload["jti"], jti, expires_at)
+        if user_id is None:
+            # 已轮换的令牌被再次使用，视为泄露，作废该用户全部刷新令牌
+            await self.refresh_tokens.revoke_all(payload["id"])
+            logger.warning(f"Refresh token reuse detected for user {payload['sub']}")
+            raise UnauthorizedException(detail="Invalid refresh token")
+
+        access_token = create_user_access_token(
+            user, expires_delta=timedelta(minutes=settings.JWT_EXPIRATION)
+        )
+        return Token(access_token=access_token, refresh_token=new_refresh_token)
+
+    async def logout(self, refresh_token: str, access_token: str | None = None) -> None:
+        """Revoke a refresh token and, if given, the access token in use."""
+        payload = decode_refresh_token(refresh_token)
+        await self.refresh_tokens.revoke(payload["jti"])
+        if access_token:
+            await revoke_access_token(access_token)
 
     async def get_user(self, user_id: int) -> UserResponse:
         """Get user by ID."""
@@ -0,0 +1,87 @@
+import hashlib
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.exceptions import NotModifiedException
+from app.core.security import get_current_user
+from app.models.models import User
+from app.schemas.schemas import UserResponse
+
+
+async def bump_data_version(session: AsyncSession, user_id: int) -> None:
+    """Mark a user's lists and todos as changed.
+
+    Must run inside the write operation, so the new version commits (or
+    rolls back) together with the change it describes.
+    """
+    await session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def get_data_version(session: AsyncSession, user_id: int) -> int:
+    """Current data version of a user, a single primary-key lookup."""
+    version = await session.scalar(select(User.data_version).where(User.id == user_id))
+    return version or 0
+
+
+def make_etag(user_id: int, version: int, request: Request) -> str:
+    """Build a weak ETag from the user's data version and what was asked for."""
+    query = sorted(request.query_params.multi_items())
+    key = f"{user_id}|{request.url.path}?{query}|{request.headers.get('accept', '')}"
+    digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user),
+) -> str:
+    """Dependency answering conditional GETs from the user's data version.
+
+    Raises NotModifiedException when If-None-Match matches, before the route
+    queries any list or todo. Otherwise sets the ETag header and returns it;
+    the version is kept for ``data_version``.
+    The version is read before the payload, so a concurrent write can only
+    make the ETag older than the body, which costs the client one extra
+    refetch but never serves stale data as current.
+
+    Raises:
+        NotModifiedException: If the client's cached representation is current.
+    """
+    version = await get_data_version(session, current_user.id)
+    request.state.data_version = version
+    etag = make_etag(current_user.id, version, request)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModifiedException(etag)
+    response.headers["ETag"] = etag
+    return etag
+
+
+async def data_version(request: Request, etag: str = Depends(conditional_get)) -> int:
+    """Dependency returning the data version conditional_get read for this request.
+
+    Services key their cached responses by it, so a body loaded before a
+    write on another worker is never served under the newer ETag.
+    """
+    return request.state.data_version
@@ -0,0 +1,138 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import Select, asc, desc, literal, tuple_
+
+from app.core.exceptions import BadRequestException
+from app.models.models import Priority, Todos
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# order_by 参数 -> (排序字段, 是否降序)
+TODO_ORDERINGS = {
+    "created_at desc": ("created_at", True),
+    "created_at asc": ("created_at", False),
+    "priority desc": ("priority", True),
+    "priority asc": ("priority", False),
+}
+
+# 排序字段 -> 排序列；priority 按级别 low < medium < high 排序，而不是按枚举名
+SORT_COLUMNS = {
+    "created_at": Todos.created_at,
+    "priority": Todos.priority_rank,
+}
+
+
+def encode_cursor(data: dict) -> str:
+    """Encode cursor data as an opaque url-safe string."""
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise BadRequestException("Invalid cursor")
+    # 游标可被客户端篡改，类型不对时返回 400 而不是在查询中出错
+    if (
+        not isinstance(data, dict)
+        or type(data.get("id")) is not int
+        or not isinstance(data.get("value", ""), str)
+        or not isinstance(data.get("order"), str | None)
+    ):
+        raise BadRequestException("Invalid cursor")
+    return data
+
+
+def _sort_value(todo, field: str) -> str:
+    value = getattr(todo, field)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Priority):
+        return value.name
+    return value
+
+
+def _parse_sort_value(value: str, field: str):
+    if field == "created_at":
+        return datetime.fromisoformat(value)
+    # 游标中保存枚举名，比较使用 priority_rank 的值
+    return Priority[value].value
+
+
+def order_todos(
+    query: Select,
+    order_by: str | None,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Select:
+    """Apply ordering and, when a limit is given, keyset pagination.
+
+    Rows are always ordered by ``id`` as a tie-breaker, so a cursor pins an
+    exact position and every page is a range scan from that position. One
+    extra row is fetched to tell whether a next page exists.
+    """
+    if order_by not in TODO_ORDERINGS:
+        order_by = None
+    field, descending = TODO_ORDERINGS.get(order_by, (None, False))
+    column = SORT_COLUMNS.get(field)
+    direction = desc if descending else asc
+
+    if cursor:
+        data = decode_cursor(cursor)
+        if data.get("order") != order_by:
+            raise BadRequestException("Cursor does not match order_by")
+        try:
+            if column is None:
+                after = Todos.id > data["id"]
+            else:
+                key = tuple_(column, Todos.id)
+                position = tuple_(
+                    literal(_parse_sort_value(data["value"], field), column.type),
+                    literal(data["id"]),
+                )
+                after = key < position if descending else key > position
+        except (KeyError, ValueError):
+            raise BadRequestException("Invalid cursor")
+        query = query.where(after)
+
+    if column is not None:
+        query = query.order_by(direction(column), direction(Todos.id))
+    else:
+        query = query.order_by(Todos.id)
+
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def page_fields(order_by: str | None) -> tuple[str, ...]:
+    """Fields every fetched row must carry for build_page to make a cursor."""
+    field, _ = TODO_ORDERINGS.get(order_by, (None, False))
+    return ("id",) if field is None else ("id", field)
+
+
+def build_page(
+    todos: Sequence, order_by: str | None, limit: int
+) -> tuple[list, str | None]:
+    """Split a fetched page into its items and the cursor of the next page.
+
+    Works on ORM todos and on read-model rows alike.
+    """
+    if len(todos) <= limit:
+        return list(todos), None
+    items = list(todos[:limit])
+    last = items[-1]
+    data = {"order": order_by if order_by in TODO_ORDERINGS else None, "id": last.id}
+    field, _ = TODO_ORDERINGS.get(order_by, (None, False))
+    if field is not None:
+        data["value"] = _sort_value(last, field)
+    return items, encode_cursor(data)
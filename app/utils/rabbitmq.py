@@ -1,7 +1,7 @@
 import os
 import asyncio
 import json
-from aio_pika import connect_robust, Message, DeliveryMode, IncomingMessage
+from aio_pika import connect_robust, ExchangeType, Message, DeliveryMode, IncomingMessage
 from aio_pika.abc import AbstractRobustConnection, AbstractChannel
 from app.core.logging import get_logger
 
@@ -23,6 +23,8 @@ class RabbitMQClient:
         return cls._instance
 
     def __init__(self):
+        if getattr(self, "host", None) is not None:
+            return  # 单例只初始化一次，避免丢弃已建立的连接
         self.host = RIBBITMQ_URL
         self.connection: AbstractRobustConnection | None = None
         self.channel: AbstractChannel | None = None
@@ -76,6 +78,42 @@ class RabbitMQClient:
             logger.error(f"Failed to consume messages: {e}")
             raise
 
+    async def publish_fanout(self, message: dict, exchange: str):
+        """广播消息到 fanout 交换机，所有订阅的 worker 都会收到"""
+        await self.connect()  # 确保连接可用
+        try:
+            exchange_obj = await self.channel.declare_exchange(exchange, ExchangeType.FANOUT)
+            message_body = json.dumps(message, ensure_ascii=False).encode()
+            await exchange_obj.publish(Message(body=message_body), routing_key="")
+            logger.debug(f"Published message to exchange '{exchange}': {message}")
+        except Exception as e:
+            logger.error(f"Failed to publish message: {e}")
+            raise
+
+    async def consume_fanout(self, exchange: str, callback, on_reconnect=None):
+        """订阅 fanout 交换机，使用独立连接和独占队列，任务取消时关闭连接"""
+        connection = await connect_robust(self.host)
+        if on_reconnect is not None:
+            connection.reconnect_callbacks.add(lambda *_: on_reconnect())
+        try:
+            channel = await connection.channel()
+            exchange_obj = await channel.declare_exchange(exchange, ExchangeType.FANOUT)
+            queue_obj = await channel.declare_queue(exclusive=True, auto_delete=True)
+            await queue_obj.bind(exchange_obj)
+
+            async def on_message(message: IncomingMessage):
+                async with message.process(ignore_processed=True):
+                    try:
+                        await callback(json.loads(message.body.decode()))
+                    except Exception as e:
+                        logger.error(f"Failed to process message from exchange '{exchange}': {e}")
+
+            await queue_obj.consume(on_message)
+            logger.info(f"Subscribed to exchange: {exchange}")
+            await asyncio.Future()  # 永久等待，除非任务取消
+        finally:
+            await connection.close()
+
     async def close(self):
         """关闭 RabbitMQ 连接"""
         if self.connection and not self.connection.is_closed:
@@ -0,0 +1,64 @@
+"""Encoding a todo listing: ORM + TodoResponse vs rows + encode_todos.
+
+Loads N todos once, then times only the Python side of GET /todos:
+the old path validated a TodoResponse per ORM object and let FastAPI
+revalidate and serialize them against response_model; the new path
+encodes the selected rows with app.schemas.rows.encode_todos.
+
+Usage (from the repository root):
+    python scripts/bench_encode.py --rows 1000 10000 100000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchlib import median_ms, scratch_database, seed  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7} {'orm+model ms':>13} {'encode_todos ms':>16}")
+    for rows in args.rows:
+        with scratch_database() as path:
+            seed(path, rows)
+            from pydantic import TypeAdapter
+            from sqlalchemy import create_engine, select
+            from sqlalchemy.orm import Session
+
+            from app.models.models import Todos
+            from app.repository.read_models import TODO_ROW_COLUMNS
+            from app.schemas.rows import encode_todos
+            from app.schemas.schemas import TodoResponse
+
+            # FastAPI 对 response_model 的处理：再次校验后序列化
+            response_adapter = TypeAdapter(list[TodoResponse])
+
+            with Session(create_engine(f"sqlite:///{path}")) as session:
+                todos = session.scalars(select(Todos).order_by(Todos.id)).all()
+                todo_rows = session.execute(select(*TODO_ROW_COLUMNS).order_by(Todos.id)).all()
+
+                def old() -> bytes:
+                    models = [TodoResponse.model_validate(todo) for todo in todos]
+                    return response_adapter.dump_json(
+                        response_adapter.validate_python(models, from_attributes=True)
+                    )
+
+                def new() -> bytes:
+                    return encode_todos(todo_rows, None, None)
+
+                assert old() == new()
+                old_ms = median_ms(old, args.repeat)
+                new_ms = median_ms(new, args.repeat)
+            print(f"{rows:>7} {old_ms:>13.1f} {new_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Write and read throughput of the app under each DB_PROFILE.
+
+Each profile runs in its own process (the engine and its PRAGMAs are
+fixed at import time) against a scratch database seeded with N todos.
+Through the in-process app it measures concurrent POST
+/lists/{id}/todos, concurrent GET /todos pages, and both at once.
+The response cache is disabled so every read reaches SQLite.
+
+Usage (from the repository root):
+    python scripts/bench_profiles.py --profiles default production --rows 100000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchlib import app_client, run_concurrently, scratch_database, seed  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with app_client("user2") as client:
+        list_id = (await client.post("/lists", json={"title": "bench"})).json()["id"]
+
+        async def write(i: int):
+            return await client.post(
+                f"/lists/{list_id}/todos", json={"content": f"bench {i}", "priority": "low"}
+            )
+
+        async def read(i: int):
+            return await client.get("/todos", params={"limit": 50, "order_by": "created_at desc"})
+
+        print(f"profile {os.environ['DB_PROFILE']} ({args.rows} seeded todos, concurrency {args.concurrency})")
+        writes = await run_concurrently(write, args.requests, args.concurrency)
+        print(f"  {'writes':<13} {writes.summary()}")
+        reads = await run_concurrently(read, args.requests, args.concurrency)
+        print(f"  {'reads':<13} {reads.summary()}")
+
+        half = max(args.concurrency // 2, 1)
+        writes, reads = await asyncio.gather(
+            run_concurrently(write, args.requests, half),
+            run_concurrently(read, args.requests, half),
+        )
+        print(f"  {'mixed writes':<13} {writes.summary()}")
+        print(f"  {'mixed reads':<13} {reads.summary()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    parser.add_argument("--rows", type=int, default=100_000, help="todos seeded before measuring")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per phase")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.child:
+        for profile in args.profiles:
+            env = {**os.environ, "DB_PROFILE": profile, "RESPONSE_CACHE_ENABLED": "false"}
+            subprocess.run([sys.executable, __file__, "--child", *sys.argv[1:]], env=env, check=True)
+        return
+
+    with scratch_database() as path:
+        # user1 持有预置数据，压测用户 user2 的读取同样要在大表中按索引定位
+        seed(path, args.rows)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
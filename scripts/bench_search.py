@@ -0,0 +1,66 @@
+"""Todo search: FTS5 trigram index vs a LIKE scan over the user's todos.
+
+Seeds one user with N todos of mixed Chinese/English content and times the
+statement GET /todos?search= runs against the plain
+``content ILIKE '%term%'`` filter it replaced, both fetching every match.
+
+Usage (from the repository root):
+    python scripts/bench_search.py --rows 100000 1000000
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchlib import median_ms, scratch_database, seed  # noqa: E402
+
+TERMS = ["提交报告", "牛奶", "milk", "#4242", "报告 milk", "不存在的词"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with scratch_database() as path:
+            seed(path, rows)
+            from sqlalchemy import select
+            from sqlalchemy.dialects import sqlite
+
+            from app.models.models import Todos
+            from app.repository.read_models import TODO_ROW_COLUMNS
+            from app.repository.todo_repo import TodosRepository
+
+            repo = TodosRepository(None)
+            con = sqlite3.connect(path)
+
+            def compiled(query) -> str:
+                return str(
+                    query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+                )
+
+            print(f"\n{rows} todos")
+            print(f"{'search':<12} {'matches':>8} {'fts ms':>9} {'ilike ms':>9}")
+            for term in TERMS:
+                fts = compiled(repo._ordered(repo._filtered_query(1, search=term), term, None))
+                ilike = compiled(
+                    select(*TODO_ROW_COLUMNS)
+                    .where(Todos.user_id == 1, *(Todos.content.ilike(f"%{word}%") for word in term.split()))
+                    .order_by(Todos.id)
+                )
+                matches = len(con.execute(fts).fetchall())
+                assert matches == len(con.execute(ilike).fetchall()), term
+                fts_ms = median_ms(lambda: con.execute(fts).fetchall(), args.repeat)
+                ilike_ms = median_ms(lambda: con.execute(ilike).fetchall(), args.repeat)
+                print(f"{term:<12} {matches:>8} {fts_ms:>9.1f} {ilike_ms:>9.1f}")
+            con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Concurrent writers with and without the single-writer queue.
+
+Runs the app in-process once with DB_WRITER_ENABLED=false (every request
+commits on its own pooled connection) and once with it enabled (writes
+are queued and group-committed by app.core.writer), and measures
+concurrent POST /lists/{id}/todos at several concurrency levels.
+
+Usage (from the repository root):
+    python scripts/bench_writer.py --concurrency 1 8 32 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchlib import app_client, run_concurrently, scratch_database  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.writer import writer
+
+    async with app_client() as client:
+        list_id = (await client.post("/lists", json={"title": "bench"})).json()["id"]
+
+        async def write(i: int):
+            return await client.post(
+                f"/lists/{list_id}/todos", json={"content": f"bench {i}", "priority": "low"}
+            )
+
+        print(f"DB_WRITER_ENABLED={os.environ['DB_WRITER_ENABLED']} (DB_PROFILE={os.environ['DB_PROFILE']})")
+        for concurrency in args.concurrency:
+            before = writer.stats()
+            result = await run_concurrently(write, args.requests, concurrency)
+            line = f"  x{concurrency:<4} {result.summary()}"
+            if writer.running:
+                after = writer.stats()
+                batches = after["batches"] - before["batches"]
+                operations = after["operations"] - before["operations"]
+                line += f"  avg batch {operations / batches:.1f}"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per level")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.child:
+        for enabled in ("false", "true"):
+            env = {
+                "DB_PROFILE": "production",
+                **os.environ,
+                "DB_WRITER_ENABLED": enabled,
+            }
+            subprocess.run([sys.executable, __file__, "--child", *sys.argv[1:]], env=env, check=True)
+        return
+
+    with scratch_database():
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
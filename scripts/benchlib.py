@@ -0,0 +1,187 @@
+"""Shared helpers for the benchmark scripts: scratch databases and seed data.
+
+Set SQLITE_DB_PATH (see scratch_database) before importing anything from
+``app``, since the engine is created at import time.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 中英混合的待办内容素材
+CN_WORDS = [
+    "买牛奶", "周五提交报告", "预约牙医", "整理发票", "给妈妈打电话", "续费会员",
+    "准备周会材料", "修复登录问题", "取快递", "交水电费", "复习英语", "健身一小时",
+    "写周报", "更新简历", "订机票", "洗车", "还信用卡", "备份照片", "读完一本书",
+    "打扫厨房", "买生日礼物", "检查合同", "提交报销单", "安排面试", "升级系统",
+]
+EN_WORDS = [
+    "milk", "report", "dentist", "invoice", "call", "renew", "meeting", "login",
+    "parcel", "bills", "english", "gym", "weekly", "resume", "flight", "car",
+    "credit", "backup", "book", "kitchen", "gift", "contract", "expense", "interview",
+]
+PRIORITIES = ("low", "medium", "high")
+
+
+@contextmanager
+def scratch_database(keep: str | None = None) -> Iterator[str]:
+    """Point SQLITE_DB_PATH at a fresh, migrated database file and yield its path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = keep or os.path.join(tmp, "bench.sqlite3")
+        os.environ["SQLITE_DB_PATH"] = path
+        os.environ.setdefault("DB_ECHO", "false")
+        migrate(path)
+        yield path
+
+
+def migrate(path: str) -> None:
+    """Run the Alembic migrations against ``path``."""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT,
+        env={**os.environ, "SQLITE_DB_PATH": path},
+        check=True,
+        capture_output=True,
+    )
+
+
+def seed(path: str, todos: int, users: int = 1, lists_per_user: int = 10, seed: int = 42) -> None:
+    """Insert users (user1, user2, ...), their lists and ``todos`` todos spread over them."""
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    con = sqlite3.connect(path)
+    with con:
+        con.executemany(
+            "INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, '')",
+            [(u, f"user{u}", f"user{u}@example.com") for u in range(1, users + 1)],
+        )
+        list_ids = []
+        for u in range(1, users + 1):
+            for n in range(lists_per_user):
+                cur = con.execute(
+                    "INSERT INTO lists (title, user_id) VALUES (?, ?)", (f"list {n}", u)
+                )
+                list_ids.append((cur.lastrowid, u))
+
+        def rows():
+            for i in range(todos):
+                list_id, user_id = list_ids[i % len(list_ids)]
+                content = (
+                    f"{rng.choice(CN_WORDS)} {rng.choice(EN_WORDS)} #{rng.randrange(100000)}"
+                )
+                created_at = start + timedelta(seconds=i)
+                yield (
+                    content,
+                    rng.choice(PRIORITIES),
+                    created_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+                    rng.random() < 0.3,
+                    list_id,
+                    user_id,
+                )
+
+        con.executemany(
+            "INSERT INTO todos (content, priority, created_at, completed, list_id, user_id) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows(),
+        )
+    con.close()
+
+
+def median_ms(func: Callable[[], object], repeat: int = 5) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return 1000 * statistics.median(times)
+
+
+@asynccontextmanager
+async def app_client(
+    username: str = "bench", broker: bool = False
+) -> AsyncIterator["httpx.AsyncClient"]:
+    """Run the app in-process and yield a client logged in as a fresh user.
+
+    Without ``broker`` the RabbitMQ publishes (notifications, cache
+    invalidations) are replaced by no-ops, so only the database is measured.
+    """
+    import httpx
+
+    from app.main import app
+    from app.utils.rabbitmq import RabbitMQClient
+
+    if not broker:
+        async def _discard(self, message: dict, *args, **kwargs) -> None:
+            return None
+
+        RabbitMQClient.send_message = _discard
+        RabbitMQClient.publish_fanout = _discard
+
+    # 本地没有 RabbitMQ 时监听器会反复重连，屏蔽其日志
+    logging.disable(logging.CRITICAL)
+    # 未处理的异常按 500 计入结果，而不是中断压测
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            password = "secret"
+            await client.post(
+                "/auth/register",
+                json={"username": username, "email": f"{username}@example.com", "password": password},
+            )
+            response = await client.post(
+                "/auth/login", data={"username": username, "password": password}
+            )
+            client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+            yield client
+
+
+async def run_concurrently(
+    request: Callable[[int], Awaitable["httpx.Response"]], total: int, concurrency: int
+) -> "LoadResult":
+    """Issue ``total`` requests from ``concurrency`` workers."""
+    counter = iter(range(total))
+    result = LoadResult()
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            status = (await request(i)).status_code
+            result.latencies.append(time.perf_counter() - start)
+            result.statuses[status] = result.statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+@dataclass
+class LoadResult:
+    elapsed: float = 0.0
+    statuses: dict[int, int] = field(default_factory=dict)
+    latencies: list[float] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Throughput, latency percentiles and status counts on one line."""
+        latencies = sorted(self.latencies)
+        p99 = latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+        return (
+            f"{len(latencies) / self.elapsed:>7.0f} req/s  "
+            f"p50 {1000 * statistics.median(latencies):>6.1f} ms  "
+            f"p99 {1000 * p99:>6.1f} ms  {self.statuses}"
+        )
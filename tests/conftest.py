@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 测试使用临时数据库；app 在导入时创建引擎，必须在导入任何 app 模块之前设置
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ["SQLITE_DB_PATH"] = os.path.join(_tmpdir.name, "test.sqlite3")
+os.environ["DB_ECHO"] = "false"
+os.environ["DB_WRITER_ENABLED"] = "false"
+
+
+@pytest.fixture(scope="session")
+def db_path() -> str:
+    """Path of the test database, migrated to the latest revision."""
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    )
+    return os.environ["SQLITE_DB_PATH"]
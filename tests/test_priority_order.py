@@ -0,0 +1,94 @@
+"""``order_by=priority`` ranks by level, and the dashboard uses the same order.
+
+priority is stored as the enum name, so sorting the column itself would put
+high < low < medium. Listings sort on priority_rank instead.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.database import SessionLocal, engine
+from app.repository.todo_repo import TodosRepository
+from app.utils.pagination import build_page
+
+# (content, priority, completed)，按 id 递增插入
+TODOS = [
+    ("a", "medium", False),
+    ("b", "low", False),
+    ("c", "high", False),
+    ("d", "medium", False),
+    ("e", "high", True),
+    ("f", "low", False),
+    ("g", "high", False),
+]
+
+
+@pytest.fixture(scope="module")
+def user_id(db_path):
+    con = sqlite3.connect(db_path)
+    with con:
+        user_id = con.execute(
+            "INSERT INTO users (username, email, password_hash) "
+            "VALUES ('ranker', 'ranker@example.com', '')"
+        ).lastrowid
+        list_id = con.execute(
+            "INSERT INTO lists (title, user_id) VALUES ('ranked', ?)", (user_id,)
+        ).lastrowid
+        con.executemany(
+            "INSERT INTO todos (content, priority, completed, created_at, list_id, user_id) "
+            "VALUES (?, ?, ?, '2025-01-01 00:00:00', ?, ?)",
+            [(content, priority, completed, list_id, user_id) for content, priority, completed in TODOS],
+        )
+    con.close()
+    return user_id
+
+
+def run(read):
+    """Run ``read(repo)`` in a fresh session and event loop."""
+
+    async def _run():
+        try:
+            async with SessionLocal() as session:
+                return await read(TodosRepository(session))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run())
+
+
+def contents(rows) -> list[str]:
+    return [row.content for row in rows]
+
+
+def test_priority_desc_ranks_by_level(user_id):
+    rows = run(lambda repo: repo.get_all(user_id, status="unfinished", order_by="priority desc"))
+    assert contents(rows) == ["g", "c", "d", "a", "f", "b"]
+
+
+def test_priority_asc_ranks_by_level(user_id):
+    rows = run(lambda repo: repo.get_all(user_id, status="unfinished", order_by="priority asc"))
+    assert contents(rows) == ["b", "f", "a", "d", "c", "g"]
+
+
+def test_dashboard_matches_priority_desc(user_id):
+    listed = run(lambda repo: repo.get_all(user_id, status="unfinished", order_by="priority desc"))
+    for top in range(1, len(TODOS) + 1):
+        ranked = run(lambda repo: repo.get_top_unfinished(user_id, top))
+        assert contents(ranked) == contents(listed)[:top]
+
+
+def test_priority_pages_follow_rank(user_id):
+    seen, cursor = [], None
+    while True:
+        rows = run(
+            lambda repo: repo.get_all(
+                user_id, order_by="priority desc", limit=2, cursor=cursor
+            )
+        )
+        page, cursor = build_page(rows, "priority desc", 2)
+        seen.extend(contents(page))
+        if cursor is None:
+            break
+    assert seen == ["g", "e", "c", "d", "a", "f", "b"]
@@ -0,0 +1,59 @@
+"""Every todo listing shape must be served by an index range scan.
+
+A ``SCAN todos`` or ``USE TEMP B-TREE`` in the plan means a filter or an
+ORDER BY lost its index, so the query grows with the user's whole todo
+count instead of the page size. Rank-ordered full-text searches are
+excluded: ordering by relevance always needs a sort.
+"""
+
+import itertools
+import sqlite3
+
+import pytest
+from sqlalchemy.dialects import sqlite
+
+from app.repository.todo_repo import TodosRepository
+from app.utils.pagination import TODO_ORDERINGS, encode_cursor
+
+LIST_IDS = [None, 5]
+STATUSES = [None, "finished", "unfinished"]
+ORDERINGS = [None, *TODO_ORDERINGS]
+
+
+def _cursor(order_by: str | None) -> str:
+    data = {"order": order_by, "id": 10}
+    if order_by is not None:
+        data["value"] = "2025-01-01T00:00:00" if order_by.startswith("created_at") else "low"
+    return encode_cursor(data)
+
+
+def _plan(con: sqlite3.Connection, query) -> list[str]:
+    sql = str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+    return [row[3] for row in con.execute("EXPLAIN QUERY PLAN " + sql)]
+
+
+@pytest.fixture(scope="module")
+def con(db_path):
+    con = sqlite3.connect(db_path)
+    yield con
+    con.close()
+
+
+@pytest.mark.parametrize(
+    "list_id, status, order_by, paged",
+    list(itertools.product(LIST_IDS, STATUSES, ORDERINGS, [False, True])),
+)
+def test_todo_listing_uses_index(con, list_id, status, order_by, paged):
+    repo = TodosRepository(None)
+    query = repo._filtered_query(1, list_id, status)
+    query = repo._ordered(
+        query,
+        None,
+        order_by,
+        limit=50 if paged else None,
+        cursor=_cursor(order_by) if paged else None,
+    )
+    plan = _plan(con, query)
+    assert not any(
+        step.startswith("SCAN todos") or "USE TEMP B-TREE" in step for step in plan
+    ), plan
@@ -0,0 +1,150 @@
+"""Single-item writes cost one statement plus the data_version bump.
+
+Each write path issues exactly one INSERT/UPDATE/DELETE ... RETURNING for
+the row itself and one UPDATE of users.data_version (see
+app.utils.etag.bump_data_version) - no read-before-write, no refresh
+after it. A miss issues only the write statement.
+"""
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.core.exceptions import NotFoundException
+from app.repository.list_repo import TodoListRepository
+from app.repository.todo_repo import TodosRepository
+from app.schemas.schemas import ListCreate, ListUpdate, TodoCreate, TodoUpdate
+
+
+@pytest.fixture(scope="module")
+def user(db_path):
+    con = sqlite3.connect(db_path)
+    with con:
+        user_id = con.execute(
+            "INSERT INTO users (username, email, password_hash) "
+            "VALUES ('counter', 'counter@example.com', '')"
+        ).lastrowid
+    con.close()
+    return SimpleNamespace(id=user_id)
+
+
+@pytest.fixture(scope="module")
+def other_user(db_path):
+    con = sqlite3.connect(db_path)
+    with con:
+        user_id = con.execute(
+            "INSERT INTO users (username, email, password_hash) "
+            "VALUES ('intruder', 'intruder@example.com', '')"
+        ).lastrowid
+    con.close()
+    return SimpleNamespace(id=user_id)
+
+
+@pytest.fixture
+def statements():
+    """Verbs of the statements sent to the database while the test runs."""
+    seen: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement.split(None, 1)[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    yield seen
+    event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+def run(write):
+    """Run ``write(session)`` in a fresh session and event loop."""
+
+    async def _run():
+        try:
+            async with SessionLocal() as session:
+                return await write(session)
+        finally:
+            # 连接绑定在当前事件循环上，每个测试结束时释放
+            await engine.dispose()
+
+    return asyncio.run(_run())
+
+
+def make_list(user, title: str) -> int:
+    new_list = run(lambda s: TodoListRepository(s).create(ListCreate(title=title), user))
+    return new_list.id
+
+
+def make_todo(user, list_id: int) -> int:
+    todo = run(
+        lambda s: TodoListRepository(s).create_todo(
+            list_id, TodoCreate(content="milk", priority="low"), user
+        )
+    )
+    return todo.id
+
+
+def test_create_list(user, statements):
+    make_list(user, "create")
+    assert statements == ["INSERT", "UPDATE"]
+
+
+def test_update_list(user, statements):
+    list_id = make_list(user, "update")
+    make_todo(user, list_id)
+    statements.clear()
+    summary = run(
+        lambda s: TodoListRepository(s).update(list_id, ListUpdate(title="updated"), user)
+    )
+    assert statements == ["UPDATE", "UPDATE"]
+    assert (summary.title, summary.todo_count, summary.low_count) == ("updated", 1, 1)
+
+
+def test_delete_list(user, statements):
+    list_id = make_list(user, "delete")
+    make_todo(user, list_id)
+    statements.clear()
+    run(lambda s: TodoListRepository(s).delete(list_id, user))
+    assert statements == ["DELETE", "UPDATE"]
+
+
+def test_create_todo(user, statements):
+    list_id = make_list(user, "create todo")
+    statements.clear()
+    make_todo(user, list_id)
+    assert statements == ["INSERT", "UPDATE"]
+
+
+def test_update_todo(user, statements):
+    todo_id = make_todo(user, make_list(user, "update todo"))
+    statements.clear()
+    todo = run(
+        lambda s: TodosRepository(s).update(todo_id, TodoUpdate(completed=True), user)
+    )
+    assert statements == ["UPDATE", "UPDATE"]
+    assert todo.completed is True
+
+
+def test_delete_todo(user, statements):
+    todo_id = make_todo(user, make_list(user, "delete todo"))
+    statements.clear()
+    run(lambda s: TodosRepository(s).delete(todo_id, user))
+    assert statements == ["DELETE", "UPDATE"]
+
+
+def test_missing_todo_skips_bump(user, statements):
+    with pytest.raises(NotFoundException):
+        run(lambda s: TodosRepository(s).delete(10**9, user))
+    assert statements == ["DELETE"]
+
+
+def test_create_todo_in_foreign_list(user, other_user, statements):
+    list_id = make_list(user, "foreign")
+    statements.clear()
+    with pytest.raises(NotFoundException):
+        make_todo(other_user, list_id)
+    # 归属校验在 INSERT ... SELECT 内完成，未插入时不更新 data_version
+    assert statements == ["INSERT"]
+    summary = run(lambda s: TodoListRepository(s).get_by_id(list_id, user))
+    assert summary.todo_count == 0